@@ -0,0 +1,26 @@
+"""
+The widgets directory is imported as the gui package, the way the dialogs import each other. Qt runs on the offscreen
+platform, so the tests need no display.
+"""
+
+import importlib.util
+import os
+import sys
+
+import pytest
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+WIDGETS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'widgets')
+
+if 'gui' not in sys.modules:
+    spec = importlib.util.spec_from_file_location('gui', os.path.join(WIDGETS_DIR, '__init__.py'),
+                                                  submodule_search_locations=[WIDGETS_DIR])
+    sys.modules['gui'] = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(sys.modules['gui'])
+
+
+@pytest.fixture(scope='session')
+def qapp():
+    from PySide2 import QtWidgets
+    return QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
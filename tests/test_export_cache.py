@@ -0,0 +1,92 @@
+import json
+import os
+
+from gui.dialogs.ExportCache import ExportCache, content_key
+
+
+def write(path, text):
+    with open(path, 'w') as output_file:
+        output_file.write(text)
+    return str(path)
+
+
+def test_content_key_follows_settings_and_fingerprint():
+    scene_data = {'name': 'arm', 'path': 'c:/export', 'triangulate': 1}
+    assert content_key(scene_data, 'a') == content_key(dict(reversed(list(scene_data.items()))), 'a')
+    assert content_key(scene_data, 'a') != content_key(scene_data, 'b')
+    assert content_key(scene_data) != content_key(dict(scene_data, triangulate=0))
+
+
+def test_hit_while_the_export_is_unchanged(tmp_path):
+    cache = ExportCache()
+    output = write(tmp_path / 'arm.fbx', 'fbx')
+    cache.store('key', output, 'arm')
+    assert cache.lookup('key') == output
+    assert cache.lookup('other') is None
+    assert (cache.hits, cache.misses, cache.stale) == (1, 1, 0)
+
+
+def test_changed_export_is_stale(tmp_path):
+    cache = ExportCache()
+    output = write(tmp_path / 'arm.fbx', 'fbx')
+    cache.store('resized', output)
+    write(output, 'a bigger fbx')
+    assert cache.lookup('resized') is None
+
+    cache.store('touched', output)
+    stat = os.stat(output)
+    os.utime(output, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1000))
+    assert cache.lookup('touched') is None
+
+    cache.store('deleted', output)
+    os.remove(output)
+    assert cache.lookup('deleted') is None
+
+    assert cache.stale == 3
+    assert len(cache) == 0
+
+
+def test_save_and_load(tmp_path):
+    cache_path = str(tmp_path / 'cache' / 'export_cache.json')
+    output = write(tmp_path / 'arm.fbx', 'fbx')
+    cache = ExportCache(cache_path)
+    cache.store('key', output, 'arm')
+    cache.save()
+
+    assert ExportCache(cache_path).lookup('key') == output
+
+
+def test_incomplete_entries_are_dropped(tmp_path):
+    cache_path = str(tmp_path / 'export_cache.json')
+    output = write(tmp_path / 'arm.fbx', 'fbx')
+    stat = os.stat(output)
+    with open(cache_path, 'w') as cache_file:
+        json.dump([{'key': 'no stat', 'output': output},
+                   {'key': 'no size', 'output': output, 'mtime': stat.st_mtime_ns},
+                   'not an entry',
+                   {'key': 'complete', 'output': output, 'mtime': stat.st_mtime_ns, 'size': stat.st_size}],
+                  cache_file)
+
+    cache = ExportCache(cache_path)
+    assert list(cache.entries) == ['complete']
+    assert cache.lookup('no stat') is None
+
+    cache.entries['added'] = {'key': 'added', 'output': output}
+    assert cache.lookup('added') is None
+    assert cache.stale == 1
+
+
+def test_unreadable_file_leaves_the_cache_empty(tmp_path):
+    cache_path = write(tmp_path / 'export_cache.json', '{not json')
+    assert len(ExportCache(cache_path)) == 0
+
+
+def test_least_recently_used_are_evicted(tmp_path):
+    cache = ExportCache(max_entries=2)
+    outputs = [write(tmp_path / '{}.fbx'.format(i), 'fbx') for i in range(3)]
+    cache.store('0', outputs[0])
+    cache.store('1', outputs[1])
+    cache.lookup('0')
+    cache.store('2', outputs[2])
+    assert list(cache.entries) == ['0', '2']
+    assert cache.evictions == 1
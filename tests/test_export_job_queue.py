@@ -0,0 +1,100 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from gui.dialogs.ExportCache import ExportCache
+from gui.dialogs.ExportJobQueue import ExportJobQueue, stub_exporter
+
+
+def wait_for(qapp, condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, 'timed out'
+        qapp.processEvents()
+        time.sleep(0.005)
+
+
+@pytest.fixture
+def scene_dicts(tmp_path):
+    return [{'name': 'set{}'.format(i), 'path': str(tmp_path)} for i in range(6)]
+
+
+@pytest.fixture
+def gated_exporter():
+    """An exporter that blocks until the gate opens, recording the sets it was called with"""
+    gate = threading.Event()
+    exported = []
+
+    def exporter(scene_data):
+        exported.append(scene_data['name'])
+        gate.wait(5)
+        return stub_exporter(scene_data)
+
+    exporter.gate = gate
+    exporter.exported = exported
+    return exporter
+
+
+def test_every_job_succeeds(qapp, scene_dicts):
+    queue = ExportJobQueue(executor=ThreadPoolExecutor(2), max_workers=2)
+    summaries = []
+    queue.queue_finished.connect(summaries.append)
+    queue.submit(scene_dicts)
+    wait_for(qapp, lambda: summaries)
+
+    assert sorted(summaries[0]['succeeded']) == sorted(scene_data['name'] for scene_data in scene_dicts)
+    assert not queue.is_running()
+
+
+def test_cancel_all_never_starts_waiting_jobs(qapp, scene_dicts, gated_exporter):
+    executor = ThreadPoolExecutor(1)
+    queue = ExportJobQueue(exporter=gated_exporter, executor=executor, max_workers=2)
+    summaries = []
+    queue.queue_finished.connect(summaries.append)
+    queue.submit(scene_dicts)
+
+    started = []
+    queue.job_status_changed.connect(lambda name, status: status == 'running' and started.append(name))
+    queue.cancel()
+    assert started == []
+    assert queue.summary()['cancelled'] == [scene_data['name'] for scene_data in scene_dicts]
+
+    # The job already exporting finishes in the background and its result is dropped
+    gated_exporter.gate.set()
+    wait_for(qapp, lambda: summaries)
+    executor.shutdown(wait=True)
+    qapp.processEvents()
+    assert gated_exporter.exported == ['set0']
+    assert len(summaries) == 1
+    assert summaries[0]['succeeded'] == []
+    assert len(summaries[0]['cancelled']) == len(scene_dicts)
+
+
+def test_cancel_some_lets_the_rest_finish(qapp, scene_dicts, gated_exporter):
+    queue = ExportJobQueue(exporter=gated_exporter, executor=ThreadPoolExecutor(2), max_workers=2)
+    summaries = []
+    queue.queue_finished.connect(summaries.append)
+    queue.submit(scene_dicts)
+    queue.cancel(['set0', 'set3'])
+    gated_exporter.gate.set()
+    wait_for(qapp, lambda: summaries)
+
+    assert sorted(summaries[0]['cancelled']) == ['set0', 'set3']
+    assert sorted(summaries[0]['succeeded']) == ['set1', 'set2', 'set4', 'set5']
+    assert 'set3' not in gated_exporter.exported
+
+
+def test_unchanged_sets_are_cached(qapp, scene_dicts, tmp_path):
+    cache = ExportCache(str(tmp_path / 'export_cache.json'))
+    queue = ExportJobQueue(executor=ThreadPoolExecutor(2), max_workers=2, cache=cache)
+    summaries = []
+    queue.queue_finished.connect(summaries.append)
+    queue.submit(scene_dicts)
+    wait_for(qapp, lambda: summaries)
+
+    queue.submit(scene_dicts[:3] + [dict(scene_dicts[3], triangulate=1)])
+    wait_for(qapp, lambda: len(summaries) == 2)
+    assert sorted(summaries[1]['cached']) == ['set0', 'set1', 'set2']
+    assert summaries[1]['succeeded'] == ['set3']
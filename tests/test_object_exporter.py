@@ -0,0 +1,81 @@
+import io
+import json
+
+import pytest
+from PySide2.QtCore import QItemSelectionModel
+
+from gui.dialogs import ObjectExporter as object_exporter
+
+
+@pytest.fixture
+def build_exporter(qapp):
+    def build(set_count):
+        """Builds a dialog holding set00, set01, ... all exporting to the same path"""
+        exporter = object_exporter.ObjectExporter()
+        exporter.scene_data_changed([{'name': 'set{:02d}'.format(i), 'path': 'c:/export'} for i in range(set_count)])
+        return exporter
+    return build
+
+
+def select_rows(exporter, rows):
+    proxy = exporter.selection_set_proxy
+    selection_model = exporter.selection_set_listview.selectionModel()
+    for row in rows:
+        selection_model.select(proxy.index(row, 0), QItemSelectionModel.Select)
+
+
+def selected_names(exporter):
+    proxy = exporter.selection_set_proxy
+    return {proxy.data(index) for index in exporter.selection_set_listview.selectionModel().selectedIndexes()}
+
+
+@pytest.mark.parametrize('set_count, selected_rows, removed_name, filter_text', [
+    (6, [3, 4, 5], 'set00', ''),
+    (6, [0, 1, 2], 'set01', ''),
+    (20, range(20), 'set05', ''),
+    (20, range(5), 'set01', 'set'),
+], ids=['above the selection', 'inside the selection', 'everything selected', 'filtered'])
+def test_remove_keeps_selection(build_exporter, set_count, selected_rows, removed_name, filter_text):
+    exporter = build_exporter(set_count)
+    exporter.selection_set_filter.setText(filter_text)
+    select_rows(exporter, selected_rows)
+
+    expected = selected_names(exporter) - {removed_name}
+    exporter.remove_selection_set(removed_name)
+    assert selected_names(exporter) == expected
+    assert len(exporter.selection_aggregate) == len(expected)
+
+
+def test_scene_update_keeps_selection(build_exporter):
+    exporter = build_exporter(10)
+    select_rows(exporter, (7, 8, 9))
+
+    exporter.scene_data_changed([{'name': 'set{:02d}'.format(i), 'path': 'c:/export'} for i in range(3, 10)])
+    assert selected_names(exporter) == {'set07', 'set08', 'set09'}
+    assert len(exporter.selection_aggregate) == 3
+
+
+def test_rename_onto_taken_name(build_exporter):
+    exporter = build_exporter(3)
+    assert not exporter.rename_selection_set('set00', 'set01')
+    model = exporter.selection_set_model
+    assert model.names == ['set00', 'set01', 'set02']
+    assert model.rows == {'set00': 0, 'set01': 1, 'set02': 2}
+
+    exporter.scene_data_changed([{'name': 'set02', 'path': 'c:/export'}])
+    assert model.names == ['set02']
+
+
+def test_scene_json_file_is_applied_in_chunks(build_exporter, monkeypatch):
+    monkeypatch.setattr(object_exporter, 'SCENE_CHUNK_SIZE__', 3)
+    exporter = build_exporter(10)
+    select_rows(exporter, (2, 8))
+
+    names = ['set09', 'new0', 'set02', 'set05', 'new1', 'set08', 'new2']
+    payload = [{'name': name, 'path': 'c:/export', 'triangulate': 1} for name in names]
+    exporter.scene_json_changed(io.StringIO(json.dumps(payload)))
+
+    model = exporter.selection_set_model
+    assert model.names == names
+    assert list(model.columns['triangulate']) == [1] * len(names)
+    assert selected_names(exporter) == {'set02', 'set08'}
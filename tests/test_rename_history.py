@@ -0,0 +1,57 @@
+import pytest
+
+from gui.dialogs.RenameHistory import RenameBatch, RenameHistory
+
+
+@pytest.mark.parametrize('old_names, new_names', [
+    (['arm', 'leg', 'hand'], ['L_arm', 'L_leg', 'L_hand']),
+    (['arm', 'leg', 'hand'], ['arm_01', 'leg_02', 'hand_03']),
+    (['arm_l', 'arm_r'], ['bone', 'bone']),
+    (['aaa', 'aa', 'a', ''], ['a', 'aa', 'aaaa', 'x']),
+    (['abcabc', 'héllo', 'same'], ['abc', 'hello', 'same']),
+    ([], []),
+], ids=['prefix', 'suffix', 'base name', 'repeated characters', 'shrunk', 'empty'])
+def test_old_names_round_trip(old_names, new_names):
+    batch = RenameBatch(old_names, new_names)
+    assert batch.old_names() == old_names
+    assert list(batch.new_names) == new_names
+    assert len(batch) == len(new_names)
+
+
+def test_shared_middles_are_stored_once():
+    old_names = ['obj{}'.format(i) for i in range(1000)]
+    batch = RenameBatch(old_names, ['L_' + name for name in old_names])
+    assert batch.tokens == ['']
+    assert batch.old_names() == old_names
+
+
+def test_mismatched_lengths_are_refused():
+    with pytest.raises(ValueError):
+        RenameBatch(['arm'], ['arm', 'leg'])
+
+
+def test_undo_and_redo_return_both_names():
+    history = RenameHistory()
+    history.record(['arm', 'leg'], ['L_arm', 'L_leg'])
+    history.record(['L_arm', 'L_leg'], ['L_arm_01', 'L_leg_02'])
+
+    assert history.undo() == (['L_arm_01', 'L_leg_02'], ['L_arm', 'L_leg'])
+    assert history.undo() == (['L_arm', 'L_leg'], ['arm', 'leg'])
+    assert history.undo() is None
+    assert history.redo() == (['arm', 'leg'], ['L_arm', 'L_leg'])
+
+    history.record(['L_arm', 'L_leg'], ['R_arm', 'R_leg'])
+    assert not history.can_redo()
+
+
+def test_eviction_keeps_the_latest_batch():
+    history = RenameHistory(memory_budget=1, max_batches=None)
+    for i in range(3):
+        history.record(['name{}'.format(i)], ['new{}'.format(i)])
+    assert len(history.undo_stack) == 1
+    assert history.undo() == (['new2'], ['name2'])
+
+    history = RenameHistory(max_batches=2)
+    for i in range(3):
+        history.record(['name{}'.format(i)], ['new{}'.format(i)])
+    assert [batch.new_names for batch in history.undo_stack] == [('new1',), ('new2',)]
@@ -0,0 +1,72 @@
+import itertools
+import math
+
+import pytest
+
+from gui.dialogs.RenamePlan import RenamePlan
+
+
+def per_row_rename(names, prefix='', base_name='', side='', suffix='', separator='', numeration=False,
+                   numeration_digits=0, start_number=0, remove_first=0, remove_last=0):
+    """The rename ObjectRenamer.create_new_name did one row at a time before RenamePlan"""
+    row_digits = int(math.log10(len(names))) + 1 if len(names) > 0 else 0
+    numeration_digits = numeration_digits if numeration_digits > row_digits else row_digits
+
+    new_names = []
+    for i, current_name in enumerate(names):
+        new_base_name = base_name if base_name != '' else current_name
+        new_prefix = '{}{}'.format(prefix, separator) if prefix != '' else ''
+        new_side = '{}{}'.format(separator, side) if side != '' else ''
+        new_suffix = '{}{}'.format(separator, suffix) if suffix != '' else ''
+
+        number = str(i + start_number).zfill(numeration_digits)
+        number = '{}{}'.format(separator, number) if numeration_digits > 0 else number
+        number = number if numeration else ''
+
+        final_name = '{}{}{}{}{}'.format(new_prefix, new_base_name, new_side, new_suffix, number)
+        new_names.append(final_name[remove_first:len(final_name) - remove_last])
+    return new_names
+
+
+NAMES = ['arm', 'leg', 'hand_{0}', 'foot}', ''] * 3
+
+SETTINGS = [dict(zip(('prefix', 'base_name', 'side', 'suffix', 'separator', 'numeration'), values))
+            for values in itertools.product(('', 'L'), ('', 'bone'), ('', 'l'), ('', 'jnt{'), ('', '_'), (False, True))]
+
+
+@pytest.mark.parametrize('settings', SETTINGS)
+def test_apply_matches_per_row_rename(settings):
+    assert RenamePlan(**settings).apply(NAMES) == per_row_rename(NAMES, **settings)
+
+
+@pytest.mark.parametrize('count, numeration_digits, start_number, remove_first, remove_last', [
+    (1, 0, 0, 0, 0),
+    (9, 0, 1, 0, 0),
+    (10, 4, 7, 1, 2),
+    (150, 2, 0, 3, 0),
+    (1000, 0, 995, 0, 30),
+])
+def test_numeration_and_trimming_match_per_row_rename(count, numeration_digits, start_number, remove_first,
+                                                     remove_last):
+    names = ['obj{}'.format(i) for i in range(count)]
+    settings = dict(prefix='C', side='r', separator='_', numeration=True, numeration_digits=numeration_digits,
+                    start_number=start_number, remove_first=remove_first, remove_last=remove_last)
+    assert RenamePlan(**settings).apply(names) == per_row_rename(names, **settings)
+
+
+def test_chunks_match_a_single_pass():
+    names = ['obj{}'.format(i) for i in range(250)]
+    plan = RenamePlan(prefix='C', separator='_', numeration=True, start_number=3)
+    chunks = [plan.apply(names[start:start + 64], start=start, count=len(names)) for start in range(0, 250, 64)]
+    assert list(itertools.chain.from_iterable(chunks)) == plan.apply(names)
+    assert plan.rename(names[100], 100, len(names)) == plan.apply(names)[100]
+
+
+@pytest.mark.parametrize('search, replace, search_mode, expected', [
+    ('arm', 'leg', 'text', ['leg_l', 'legleg_r', 'hand']),
+    ('*_?', r'\2_\1', 'wildcard', ['l_arm', 'r_armarm', 'hand']),
+    (r'(\w+?)_(\w)', r'\g<2>\1', 'regex', ['larm', 'rarmarm', 'hand']),
+])
+def test_search_and_replace(search, replace, search_mode, expected):
+    plan = RenamePlan(search=search, replace=replace, search_mode=search_mode)
+    assert plan.apply(['arm_l', 'armarm_r', 'hand']) == expected
@@ -0,0 +1,76 @@
+import io
+import json
+
+import pytest
+
+from gui.dialogs import SceneDataCodec
+from gui.dialogs.SceneDataCodec import SceneDataError
+
+
+def read_stream(text, chunk_size=4):
+    return list(SceneDataCodec.iter_decode(io.StringIO(text), chunk_size=chunk_size))
+
+
+PAYLOADS = [
+    '',
+    '  ',
+    '{}',
+    '[]',
+    '{"arm": {"path": "c:/export", "triangulate": 1}, "leg": {}}',
+    '[{"name": "arm", "svn": true}, {"name": "leg", "path": null}, {"name": "arm"}]',
+    ' \n{ "a b" : { "origin" : 2 } }\n ',
+]
+
+
+@pytest.mark.parametrize('text', PAYLOADS)
+def test_stream_matches_decode(text):
+    assert read_stream(text) == SceneDataCodec.decode(text)
+
+
+def test_sets_are_flattened():
+    scene_dicts = SceneDataCodec.decode('{"arm": {"path": "c:/export", "triangulate": 1}}')
+    assert scene_dicts == [dict({key: 0 for key in SceneDataCodec.INT_SETTINGS}, name='arm', path='c:/export',
+                                triangulate=1)]
+
+
+def test_encode_round_trip():
+    scene_dicts = SceneDataCodec.decode(PAYLOADS[4])
+    assert SceneDataCodec.decode(SceneDataCodec.encode(scene_dicts)) == scene_dicts
+    assert SceneDataCodec.decode(SceneDataCodec.encode(scene_dicts, as_list=True)) == scene_dicts
+
+
+@pytest.mark.parametrize('text', ['{"a": {}}}', '{"a": {}} {}', '[] x', '{"a": {}},'])
+def test_trailing_data_is_refused(text):
+    with pytest.raises(SceneDataError):
+        SceneDataCodec.decode(text)
+    with pytest.raises(SceneDataError):
+        read_stream(text)
+
+
+@pytest.mark.parametrize('payload', [
+    {'arm': {'triangulate': 'yes'}},
+    {'arm': {'path': 3}},
+    {'arm': {'origin': 1.5}},
+    {'arm': []},
+    [{'path': 'c:/export'}],
+    [{'name': ''}],
+    [{'name': 3}],
+    'arm',
+    3,
+])
+def test_type_errors_are_refused(payload):
+    text = json.dumps(payload)
+    with pytest.raises(SceneDataError):
+        SceneDataCodec.decode(text)
+    with pytest.raises(SceneDataError):
+        read_stream(text)
+    with pytest.raises(SceneDataError):
+        SceneDataCodec.encode(payload if isinstance(payload, list) else [payload])
+
+
+@pytest.mark.parametrize('text', ['{"arm": ', '[{"name": "arm"}', '{"arm" {}}', 'nope'])
+def test_invalid_json_is_refused(text):
+    with pytest.raises(SceneDataError):
+        SceneDataCodec.decode(text)
+    with pytest.raises(SceneDataError):
+        read_stream(text)
@@ -0,0 +1,176 @@
+"""
+Remembers the last successful export of every selection set, so sets that have not changed since are not exported
+again. Nothing in here touches Qt.
+
+A set's content key is the sha1 of its export dict, serialised with sorted keys, together with a fingerprint of its
+geometry supplied by the host. A cached export is only reused while its output file still has the size and
+modification time it had when it was written.
+
+    cache = ExportCache('c:/temp/export_cache.json')
+    key = content_key(scene_data, fingerprint)
+    if cache.lookup(key) is None:
+        cache.store(key, export(scene_data))
+    cache.save()
+"""
+
+import hashlib
+import json
+import os
+from collections import OrderedDict
+
+
+def content_key(scene_data, fingerprint=''):
+    """
+    Hashes a set's export settings and geometry
+    :param scene_data: The set's export dict
+    :type scene_data: dict
+    :param fingerprint: Changes whenever the set's geometry changes, e.g. a hash of its vertices and topology
+    :type fingerprint: str
+    :return: The hex digest
+    :rtype: str
+    """
+    digest = hashlib.sha1(json.dumps(scene_data, sort_keys=True, separators=(',', ':')).encode('utf-8'))
+    digest.update(b'\0')
+    digest.update(str(fingerprint).encode('utf-8'))
+    return digest.hexdigest()
+
+
+class ExportCache(object):
+    """
+    A least recently used map of content keys to the files they were exported to, saved as json
+    """
+
+    ENTRY_KEYS = ('key', 'output', 'mtime', 'size')  # What an entry needs to be looked up
+
+    def __init__(self, cache_path=None, max_entries=5000):
+        """
+        :param cache_path: The json file the cache is loaded from and saved to. None keeps it in memory only
+        :type cache_path: str | None
+        :param max_entries: How many exports to remember. The least recently used are evicted first
+        :type max_entries: int
+        """
+        self.cache_path = cache_path
+        self.max_entries = max_entries
+        self.entries = OrderedDict()  # type: OrderedDict[str, dict]
+
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0
+        self.evictions = 0
+
+        if cache_path is not None:
+            self.load()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def load(self):
+        """
+        Reads the cache file. A missing or unreadable file leaves the cache empty, and entries missing any of
+        ENTRY_KEYS are dropped
+        :return: Nothing
+        :rtype: None
+        """
+        try:
+            with open(self.cache_path, 'r') as cache_file:
+                entries = json.load(cache_file)
+        except (IOError, OSError, ValueError):
+            return
+        if isinstance(entries, list):
+            self.entries = OrderedDict((entry['key'], entry) for entry in entries
+                                       if isinstance(entry, dict) and all(key in entry for key in self.ENTRY_KEYS))
+            self.evict()
+
+    def save(self):
+        """
+        Writes the cache file, replacing it in one step so a crash never leaves half a file behind
+        :return: Nothing
+        :rtype: None
+        """
+        if self.cache_path is None:
+            return
+        directory = os.path.dirname(self.cache_path)
+        if directory and not os.path.isdir(directory):
+            os.makedirs(directory)
+        temp_path = '{}.tmp'.format(self.cache_path)
+        with open(temp_path, 'w') as cache_file:
+            json.dump(list(self.entries.values()), cache_file)
+        os.replace(temp_path, self.cache_path)
+
+    @staticmethod
+    def stat(output_path):
+        """
+        Gets what identifies the current state of an exported file
+        :param output_path: The exported file
+        :type output_path: str
+        :return: (modification time in nanoseconds, size in bytes), or None if the file is gone
+        :rtype: tuple[int, int] | None
+        """
+        try:
+            stat = os.stat(output_path)
+        except (OSError, TypeError, ValueError):
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def lookup(self, key):
+        """
+        Finds the export of a content key, counting a hit or a miss
+        :param key: The content key of a set
+        :type key: str
+        :return: The exported file, or None if the set has to be exported
+        :rtype: str | None
+        """
+        entry = self.entries.get(key, None)
+        if entry is None:
+            self.misses += 1
+            return None
+        # An entry missing its stat, e.g. one added to the dict by hand, counts as stale
+        if self.stat(entry.get('output')) != (entry.get('mtime'), entry.get('size')):
+            del self.entries[key]
+            self.stale += 1
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return entry['output']
+
+    def store(self, key, output_path, set_name=None):
+        """
+        Remembers a successful export
+        :param key: The content key of the exported set
+        :type key: str
+        :param output_path: The file the set was exported to
+        :type output_path: str
+        :param set_name: The name of the set, kept for inspecting the cache file
+        :type set_name: str | None
+        :return: Nothing
+        :rtype: None
+        """
+        stat = self.stat(output_path)
+        if stat is None:
+            return
+        self.entries[key] = {'key': key, 'name': set_name, 'output': output_path, 'mtime': stat[0], 'size': stat[1]}
+        self.entries.move_to_end(key)
+        self.evict()
+
+    def evict(self):
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        self.entries = OrderedDict()
+
+    def report(self):
+        """
+        Describes how useful the cache has been since it was created
+        :return: The hit, miss, stale and eviction counts, the hit rate and the number of entries
+        :rtype: dict
+        """
+        lookups = self.hits + self.misses
+        return {'hits': self.hits,
+                'misses': self.misses,
+                'stale': self.stale,
+                'evictions': self.evictions,
+                'hit_rate': self.hits / float(lookups) if lookups else 0.0,
+                'entries': len(self.entries)}
@@ -0,0 +1,318 @@
+"""
+Runs the exports requested by the ObjectExporter dialog off the UI thread.
+
+Every selected set becomes a job holding its scene data dict. Jobs are handed to a concurrent.futures executor, a
+thread pool by default or a process pool for exporters that can run outside the DCC, at most max_workers at a time so
+jobs still waiting in the queue can be cancelled. The host injects the callable doing the actual export:
+
+    queue = ExportJobQueue(exporter=export_fbx, max_workers=4)
+    queue.queue_finished.connect(print_summary)
+    queue.submit(scene_dicts)
+
+The exporter takes a scene data dict and returns the path it wrote. It must be a module level function when used with
+a process pool, so it can be pickled.
+
+Given an ExportCache, sets whose content key and exported file are unchanged since their last successful export are
+not exported again. Their jobs finish straight away as 'cached'.
+"""
+
+import json
+import os
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from PySide2.QtCore import QObject, Signal, Slot
+from gui.dialogs.ExportCache import content_key
+
+
+JOB_STATUSES = ['queued', 'running', 'succeeded', 'cached', 'failed', 'cancelled']
+
+
+def stub_exporter(scene_data, delay=0.0):
+    """
+    Stands in for a DCC exporter: writes the set's settings as json where the FBX would go
+    :param scene_data: The set's export dict
+    :type scene_data: dict
+    :param delay: Seconds to sleep first, to imitate a slow export
+    :type delay: float
+    :return: The path of the written file
+    :rtype: str
+    """
+    if delay:
+        time.sleep(delay)
+    output_path = export_path(scene_data)
+    with open(output_path, 'w') as output_file:
+        json.dump(scene_data, output_file, sort_keys=True)
+    return output_path
+
+
+def export_path(scene_data, extension='.fbx'):
+    """
+    Gets the file a set exports to
+    :param scene_data: The set's export dict
+    :type scene_data: dict
+    :param extension: The extension of the exported file
+    :type extension: str
+    :return: The path of the exported file
+    :rtype: str
+    """
+    return os.path.join(scene_data.get('path', None) or os.getcwd(), '{}{}'.format(scene_data['name'], extension))
+
+
+class ExportJob(object):
+    """
+    The state of one set's export
+    """
+
+    __slots__ = ('name', 'scene_data', 'key', 'status', 'result', 'error', 'future', 'started', 'elapsed')
+
+    def __init__(self, scene_data, key=None):
+        """
+        :param scene_data: The set's export dict
+        :type scene_data: dict
+        :param key: The set's content key, when the queue has a cache
+        :type key: str | None
+        """
+        self.name = scene_data['name']
+        self.scene_data = scene_data
+        self.key = key
+        self.status = 'queued'
+        self.result = None
+        self.error = None
+        self.future = None
+        self.started = None
+        self.elapsed = None
+
+
+class ExportJobQueue(QObject):
+    """
+    Queues export jobs and runs them on an executor, reporting back on the thread the queue lives in
+    """
+
+    job_status_changed = Signal(str, str)  # set name, one of JOB_STATUSES
+    progress_changed = Signal(int, int)  # finished jobs, total jobs
+    queue_finished = Signal(dict)  # the summary, see summary()
+
+    _job_done = Signal(object, object, object)  # job, result, error. Sent from the executor's threads
+
+    def __init__(self, exporter=stub_exporter, executor=None, max_workers=None, use_processes=False, cache=None,
+                 fingerprint=None, parent=None):
+        """
+        :param exporter: Called with a set's export dict, returning the path it wrote. Errors fail only that job
+        :type exporter: callable
+        :param executor: The executor to run jobs on. The queue never shuts an injected executor down
+        :type executor: concurrent.futures.Executor | None
+        :param max_workers: How many jobs run at once. Defaults to the number of CPUs
+        :type max_workers: int | None
+        :param use_processes: Use a ProcessPoolExecutor instead of a ThreadPoolExecutor when no executor is given
+        :type use_processes: bool
+        :param cache: Skips sets that have not changed since their last export. It is saved whenever the queue is done
+        :type cache: ExportCache | None
+        :param fingerprint: Called on the queue's thread with a set's export dict, returning a string that changes
+                            whenever the set's geometry does. Without it only the settings make up the content key
+        :type fingerprint: callable | None
+        """
+        super(ExportJobQueue, self).__init__(parent)
+
+        self.exporter = exporter
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.use_processes = use_processes
+        self.executor = executor
+        self.owns_executor = executor is None
+        self.cache = cache
+        self.fingerprint = fingerprint
+
+        self.jobs = []  # type: list[ExportJob]
+        self.waiting_jobs = deque()  # type: deque[ExportJob]
+        self.running_jobs = 0
+        self.cancelling = False  # Set while cancel() cancels futures, whose done callbacks then run synchronously
+        self.finished_jobs = 0
+        self.started = None
+        self.reported = True
+
+        self._job_done.connect(self.job_done)
+
+    def get_executor(self):
+        if self.executor is None:
+            executor_type = ProcessPoolExecutor if self.use_processes else ThreadPoolExecutor
+            self.executor = executor_type(max_workers=self.max_workers)
+        return self.executor
+
+    def is_running(self):
+        return self.running_jobs > 0 or len(self.waiting_jobs) > 0
+
+    def submit(self, scene_dicts):
+        """
+        Queues an export per set. Sets already waiting or running are not queued twice
+        :param scene_dicts: The export dicts of the sets to export
+        :type scene_dicts: list[dict]
+        :return: The queued jobs
+        :rtype: list[ExportJob]
+        """
+        if not self.is_running():
+            self.jobs = []
+            self.finished_jobs = 0
+            self.started = time.perf_counter()
+        self.reported = False
+
+        busy_names = set(job.name for job in self.jobs if job.status in ('queued', 'running'))
+        new_jobs = []
+        for scene_data in scene_dicts:
+            if scene_data['name'] in busy_names:
+                continue
+            busy_names.add(scene_data['name'])
+            new_jobs.append(ExportJob(dict(scene_data), self.content_key(scene_data)))
+
+        self.jobs.extend(new_jobs)
+        for job in new_jobs:
+            cached_output = self.cache.lookup(job.key) if self.cache is not None else None
+            if cached_output is not None:
+                job.status = 'cached'
+                job.result = cached_output
+                self.finished_jobs += 1
+            else:
+                self.waiting_jobs.append(job)
+            self.job_status_changed.emit(job.name, job.status)
+        self.progress_changed.emit(self.finished_jobs, len(self.jobs))
+        self.start_jobs()
+        self.check_finished()
+        return new_jobs
+
+    def content_key(self, scene_data):
+        """
+        Gets the key a set's export is cached under
+        :param scene_data: The set's export dict
+        :type scene_data: dict
+        :return: The key, or None if the queue has no cache
+        :rtype: str | None
+        """
+        if self.cache is None:
+            return None
+        return content_key(scene_data, self.fingerprint(scene_data) if self.fingerprint is not None else '')
+
+    def start_jobs(self):
+        """
+        Hands waiting jobs to the executor until max_workers are running
+        :return: Nothing
+        :rtype: None
+        """
+        executor = self.get_executor()
+        while self.waiting_jobs and self.running_jobs < self.max_workers:
+            job = self.waiting_jobs.popleft()
+            job.status = 'running'
+            job.started = time.perf_counter()
+            self.running_jobs += 1
+            self.job_status_changed.emit(job.name, job.status)
+
+            job.future = executor.submit(self.exporter, job.scene_data)
+            job.future.add_done_callback(lambda future, done_job=job: self.future_done(done_job, future))
+
+    def future_done(self, job, future):
+        """Runs on the executor's thread; passes the outcome on to the queue's thread"""
+        if future.cancelled():
+            self._job_done.emit(job, None, None)
+            return
+        error = future.exception()
+        self._job_done.emit(job, None if error is not None else future.result(), error)
+
+    @Slot(object, object, object)
+    def job_done(self, job, result, error):
+        """
+        Records the outcome of a job and starts the next one
+        :param job: The job that stopped
+        :type job: ExportJob
+        :param result: The path the exporter wrote
+        :type result: str | None
+        :param error: What the exporter raised, if anything
+        :type error: BaseException | None
+        :return: Nothing
+        :rtype: None
+        """
+        self.running_jobs -= 1
+        job.elapsed = time.perf_counter() - job.started
+        if job.status != 'cancelled':
+            job.result = result
+            job.error = None if error is None else '{}: {}'.format(type(error).__name__, error)
+            job.status = 'succeeded' if error is None else 'failed'
+            if self.cache is not None and error is None and result is not None:
+                self.cache.store(job.key, result, job.name)
+            self.finish_job(job)
+        if self.cancelling:
+            return
+        self.start_jobs()
+        self.check_finished()
+
+    def finish_job(self, job):
+        self.finished_jobs += 1
+        self.job_status_changed.emit(job.name, job.status)
+        self.progress_changed.emit(self.finished_jobs, len(self.jobs))
+
+    def check_finished(self):
+        if not self.is_running() and not self.reported:
+            self.reported = True
+            if self.cache is not None:
+                self.cache.save()
+            self.queue_finished.emit(self.summary())
+
+    def cancel(self, set_names=None):
+        """
+        Cancels jobs. Waiting jobs never run; running jobs finish in the background but their results are dropped
+        :param set_names: The sets to cancel. Defaults to every job
+        :type set_names: list[str] | None
+        :return: Nothing
+        :rtype: None
+        """
+        names = None if set_names is None else set(set_names)
+        cancelled_jobs = [job for job in self.jobs if job.status in ('queued', 'running') and
+                          (names is None or job.name in names)]
+
+        # Waiting jobs are dropped before any future is touched: cancelling a future runs its done callback right
+        # here, and job_done must not hand the next waiting job to the executor
+        self.waiting_jobs = deque(job for job in self.waiting_jobs if job.status == 'queued' and
+                                  (names is not None and job.name not in names))
+        self.cancelling = True
+        try:
+            for job in cancelled_jobs:
+                was_running = job.status == 'running'
+                job.status = 'cancelled'
+                if was_running and job.future is not None:
+                    job.future.cancel()
+                self.finish_job(job)
+        finally:
+            self.cancelling = False
+        self.start_jobs()
+        self.check_finished()
+
+    def summary(self):
+        """
+        Describes how the jobs submitted since the queue was last idle went
+        :return: The set names per status, the errors of failed sets, the exported files, the seconds since the first
+                 submit and, with a cache, its hit/miss report
+        :rtype: dict
+        """
+        summary = {status: [] for status in JOB_STATUSES}
+        summary['errors'] = dict()
+        summary['results'] = dict()
+        for job in self.jobs:
+            summary[job.status].append(job.name)
+            if job.error is not None:
+                summary['errors'][job.name] = job.error
+            if job.result is not None:
+                summary['results'][job.name] = job.result
+        summary['elapsed'] = time.perf_counter() - self.started if self.started is not None else 0.0
+        if self.cache is not None:
+            summary['cache'] = self.cache.report()
+        return summary
+
+    def shutdown(self, wait=True):
+        """
+        Cancels every job and shuts down the executor if the queue created it
+        :param wait: Block until running jobs have returned?
+        :type wait: bool
+        :return: Nothing
+        :rtype: None
+        """
+        self.cancel()
+        if self.owns_executor and self.executor is not None:
+            self.executor.shutdown(wait=wait)
+            self.executor = None
@@ -19,11 +19,18 @@ node. Either way the input to the tool is a dict with the same format as above.
 
 """
 
-from PySide2 import QtWidgets, QtGui
-from PySide2.QtCore import Qt, Signal, QModelIndex
+from PySide2 import QtWidgets
+from PySide2.QtCore import Qt, Signal, QModelIndex, QAbstractListModel, QAbstractProxyModel, QTimer
 from os.path import abspath
+from array import array
+from bisect import bisect_left
+from collections import Counter
+from itertools import islice
+import re
 from gui.ps2_BoxLayoutSeparator import BoxLayoutSeparator
 from gui.ps2_TristateCheckbox import TristateCheckbox
+from gui.dialogs.ExportJobQueue import ExportJobQueue
+from gui.dialogs import SceneDataCodec
 
 
 SELECTION_SET_OPERATIONS = ['created', 'deleted', 'name_changed']
@@ -40,19 +47,846 @@ SETTINGS__ = {'name': 0,
               'skinning': 39,
               'sceneup': 40}
 
+# The reverse of SETTINGS__, to find which setting a changed role belongs to
+SETTING_ROLES__ = {role: name for name, role in SETTINGS__.items()}
+
+# The settings stored as integers, one typed column each
+INT_SETTINGS__ = [name for name in SETTINGS__ if name not in ('name', 'path')]
+
+# How many sets scene_json_changed decodes from a file before applying them
+SCENE_CHUNK_SIZE__ = 1000
+
+
+def longest_increasing_run(values):
+    """
+    Finds the longest subsequence of values that is already in increasing order
+    :param values: The values to search, e.g. the current rows of items listed in their new order
+    :type values: list[int]
+    :return: The positions in values that make up the subsequence
+    :rtype: set[int]
+    """
+    tails = []  # tails[n] is the position ending the best subsequence of length n + 1
+    tail_values = []
+    previous = [-1] * len(values)
+    for position, value in enumerate(values):
+        length = bisect_left(tail_values, value)
+        if length > 0:
+            previous[position] = tails[length - 1]
+        if length == len(tails):
+            tails.append(position)
+            tail_values.append(value)
+        else:
+            tails[length] = position
+            tail_values[length] = value
+
+    run = set()
+    position = tails[-1] if tails else -1
+    while position != -1:
+        run.add(position)
+        position = previous[position]
+    return run
+
+
+class SelectionSetModel(QAbstractListModel):
+    """
+    A list model holding the export settings of every selection set in typed columns: a list of names, a list of paths
+    and an integer array per setting. Views read the settings through the same SETTINGS__ roles the sets used to carry
+    as QStandardItems, while the dialog reads whole columns to aggregate over a selection.
+    """
+
+    set_renamed = Signal(object, str)  # set id, the name it had. Emitted before dataChanged
+
+    def __init__(self, parent=None):
+        super(SelectionSetModel, self).__init__(parent)
+
+        self.names = []  # type: list[str]
+        self.paths = []  # type: list[str | None]
+        self.columns = {name: array('i') for name in INT_SETTINGS__}
+        self.set_ids = array('L')  # Stays with a set while its row changes
+        self.rows = dict()  # type: dict[str, int]
+        self.next_set_id = 0
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self.names)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        row = index.row()
+        if role in (Qt.DisplayRole, Qt.EditRole):
+            return self.names[row]
+        if role == SETTINGS__['path']:
+            return self.paths[row]
+        key = SETTING_ROLES__.get(role, None)
+        if key is not None:
+            return self.columns[key][row]
+        return None
+
+    def setData(self, index, value, role=Qt.EditRole):
+        """
+        Writes a set's name or one of its settings. A name another set already has is refused, since set names are
+        unique in the scene
+        """
+        if not index.isValid():
+            return False
+        row = index.row()
+        if role in (Qt.DisplayRole, Qt.EditRole):
+            if self.rows.get(value, row) != row:
+                return False
+            previous_name = self.names[row]
+            del self.rows[previous_name]
+            self.names[row] = value
+            self.rows[value] = row
+            role = Qt.DisplayRole
+            if value != previous_name:
+                self.set_renamed.emit(self.set_ids[row], previous_name)
+        elif role == SETTINGS__['path']:
+            self.paths[row] = value
+        elif role in SETTING_ROLES__:
+            self.columns[SETTING_ROLES__[role]][row] = self.to_int(value)
+        else:
+            return False
+        self.dataChanged.emit(index, index, [role])
+        return True
+
+    @staticmethod
+    def to_int(value):
+        """Converts a setting value to what its column stores. Missing values are off"""
+        return int(value) if value else 0
+
+    @staticmethod
+    def to_path(scene_item):
+        """Gets the absolute export path of a scene data dict, leaving missing and empty paths as they are"""
+        path = scene_item.get('path', None)
+        return abspath(path) if path else path
+
+    def _reindex(self, first, last=None):
+        """Refreshes the name lookup for the rows from first to last, inclusive"""
+        last = len(self.names) - 1 if last is None else last
+        names, rows = self.names, self.rows
+        for row in range(first, last + 1):
+            rows[names[row]] = row
+
+    def row_of(self, set_name):
+        """
+        Gets the row of a set
+        :param set_name: The name of the set
+        :type set_name: str
+        :return: The row, or None if there is no set of that name
+        :rtype: int | None
+        """
+        return self.rows.get(set_name, None)
+
+    def insert_sets(self, row, scene_data):
+        """
+        Inserts new sets from their scene data dicts
+        :param row: The row the first set is inserted at
+        :type row: int
+        :param scene_data: A dict per set. Missing settings default to 0
+        :type scene_data: list[dict]
+        :return: Nothing
+        :rtype: None
+        """
+        if not scene_data:
+            return
+        self.beginInsertRows(QModelIndex(), row, row + len(scene_data) - 1)
+        self.names[row:row] = [item.get('name', None) for item in scene_data]
+
+        # Sets tend to share a handful of export folders, so each distinct path is only made absolute once
+        absolute_paths = dict()
+        paths = []
+        for item in scene_data:
+            path = item.get('path', None)
+            if path not in absolute_paths:
+                absolute_paths[path] = self.to_path(item)
+            paths.append(absolute_paths[path])
+        self.paths[row:row] = paths
+
+        to_int = self.to_int
+        for key, column in self.columns.items():
+            column[row:row] = array('i', [to_int(item.get(key, 0)) for item in scene_data])
+        self.set_ids[row:row] = array('L', range(self.next_set_id, self.next_set_id + len(scene_data)))
+        self.next_set_id += len(scene_data)
+        self._reindex(row)
+        self.endInsertRows()
+
+    def removeRows(self, row, count, parent=QModelIndex()):
+        if parent.isValid() or count <= 0 or row < 0 or row + count > len(self.names):
+            return False
+        self.beginRemoveRows(QModelIndex(), row, row + count - 1)
+        for name in self.names[row:row + count]:
+            del self.rows[name]
+        del self.names[row:row + count]
+        del self.paths[row:row + count]
+        for column in self.columns.values():
+            del column[row:row + count]
+        del self.set_ids[row:row + count]
+        self._reindex(row)
+        self.endRemoveRows()
+        return True
+
+    def move_set(self, row, target):
+        """
+        Moves a single set
+        :param row: The row of the set to move
+        :type row: int
+        :param target: The row the set is placed before, counted before the move
+        :type target: int
+        :return: Nothing
+        :rtype: None
+        """
+        if target in (row, row + 1):
+            return
+        self.beginMoveRows(QModelIndex(), row, row, QModelIndex(), target)
+        destination = target - 1 if row < target else target
+        for values in [self.names, self.paths, self.set_ids] + list(self.columns.values()):
+            values.insert(destination, values.pop(row))
+        self._reindex(min(row, destination), max(row, destination))
+        self.endMoveRows()
+
+    def update_set(self, row, scene_item):
+        """
+        Writes the settings of a scene data dict to an existing set, touching only the values that differ
+        :param row: The row of the set to update
+        :type row: int
+        :param scene_item: The set's dict from the scene
+        :type scene_item: dict
+        :return: Nothing
+        :rtype: None
+        """
+        changed_roles = []
+        path = self.to_path(scene_item)
+        if self.paths[row] != path:
+            self.paths[row] = path
+            changed_roles.append(SETTINGS__['path'])
+        for key, column in self.columns.items():
+            value = self.to_int(scene_item.get(key, 0))
+            if column[row] != value:
+                column[row] = value
+                changed_roles.append(SETTINGS__[key])
+        if changed_roles:
+            index = self.index(row, 0)
+            self.dataChanged.emit(index, index, changed_roles)
+
+    def set_values(self, rows, key, value):
+        """
+        Gives one setting the same value on many sets as a single edit. Only the sets whose value differs are written,
+        and every run of neighbouring rows is announced with a single dataChanged
+        :param rows: The rows of the sets to edit
+        :type rows: list[int]
+        :param key: The setting, a key of SETTINGS__ other than 'name'
+        :type key: str
+        :param value: The new value
+        :type value: str | int | None
+        :return: The rows that changed, sorted
+        :rtype: list[int]
+        """
+        if key == 'name':
+            raise ValueError('Sets have to be renamed one at a time')
+        if key == 'path':
+            column = self.paths
+        else:
+            column = self.columns[key]
+            value = self.to_int(value)
+
+        changed_rows = sorted(row for row in set(rows) if column[row] != value)
+        for row in changed_rows:
+            column[row] = value
+
+        role = SETTINGS__[key]
+        position = 0
+        while position < len(changed_rows):
+            first = last = changed_rows[position]
+            position += 1
+            while position < len(changed_rows) and changed_rows[position] == last + 1:
+                last = changed_rows[position]
+                position += 1
+            self.dataChanged.emit(self.index(first, 0), self.index(last, 0), [role])
+        return changed_rows
+
+    def value(self, row, key):
+        """
+        Gets a single setting of a set
+        :param row: The row of the set
+        :type row: int
+        :param key: The setting, a key of SETTINGS__
+        :type key: str
+        :return: The setting's value
+        :rtype: str | int | None
+        """
+        if key == 'name':
+            return self.names[row]
+        if key == 'path':
+            return self.paths[row]
+        return self.columns[key][row]
+
+    def values(self, key, rows):
+        """
+        Gets one setting for many sets at once
+        :param key: The setting, a key of SETTINGS__
+        :type key: str
+        :param rows: The rows of the sets
+        :type rows: list[int]
+        :return: The values, in the order of rows
+        :rtype: list
+        """
+        column = self.names if key == 'name' else self.paths if key == 'path' else self.columns[key]
+        return [column[row] for row in rows]
+
+    def scene_data(self, row):
+        """
+        Builds the export dict of a set
+        :param row: The row of the set
+        :type row: int
+        :return: The set's settings, keyed like SETTINGS__
+        :rtype: dict
+        """
+        scene_data = {'name': self.names[row], 'path': self.paths[row]}
+        for key, column in self.columns.items():
+            scene_data[key] = column[row]
+        return scene_data
+
+    def all_scene_data(self):
+        """
+        Builds the export dicts of every set, a column at a time
+        :return: A dict per set, in row order
+        :rtype: list[dict]
+        """
+        scene_dicts = [{'name': name, 'path': path} for name, path in zip(self.names, self.paths)]
+        for key, column in self.columns.items():
+            for scene_data, value in zip(scene_dicts, column):
+                scene_data[key] = value
+        return scene_dicts
+
+
+class SelectionSetFilterModel(QAbstractProxyModel):
+    """
+    Filters and sorts a SelectionSetModel without calling back into Python per row or per comparison. The lowercase
+    names and paths of every set are indexed once; filtering scans that index with plain substring checks or a compiled
+    fuzzy pattern, and sorting reuses a precomputed order of the whole index. Sets added or removed in the source are
+    spliced into the index and the row mapping, and passed on as row inserts and removes, so only a filter or sort
+    change, a move or a reset lays the whole list out again. With no filter and no sort the mapping is kept as ranges,
+    making those splices independent of the number of sets.
+    """
+
+    SORT_KEYS = [None, 'name', 'path']
+    SORTED_INSERT_LIMIT = 64  # More new sets than this under a sort are laid out in one go instead of row by row
+
+    def __init__(self, parent=None):
+        super(SelectionSetFilterModel, self).__init__(parent)
+
+        self.filter_text = ''
+        self.fuzzy = False
+        self.sort_key = None  # One of SORT_KEYS. None keeps the scene order
+        self.sort_order = Qt.AscendingOrder
+
+        self.search_keys = {'name': [], 'path': []}  # type: dict[str, list[str]]
+        self.sorted_rows = {}  # type: dict[str, list[int]]  # every source row, ordered by a sort key
+        self.filtered_rows = range(0)  # type: list[int] | range  # the source rows passing the filter, in source order
+        self.source_rows = range(0)  # type: list[int] | range  # proxy row to source row
+        self.proxy_rows = range(0)  # type: array | range  # source row to proxy row, or -1
+        self.proxy_set_ids = array('L')  # proxy row to the set id, to find sets again after the source changes
+        self.updating = 0
+        self.layout_changing = False
+        self.persistent_indexes = []  # type: list[QModelIndex]  # held from begin_ to end_layout_change
+        self.persistent_ids = []  # type: list[int]
+
+    def setSourceModel(self, source_model):
+        """
+        :param source_model: The sets to filter
+        :type source_model: SelectionSetModel
+        """
+        self.beginResetModel()
+        super(SelectionSetFilterModel, self).setSourceModel(source_model)
+        # Persistent indexes have to be saved before the source changes, while every proxy row still maps to its set
+        for signal in (source_model.rowsAboutToBeMoved, source_model.layoutAboutToBeChanged,
+                       source_model.modelAboutToBeReset):
+            signal.connect(self.source_structure_about_to_change)
+        for signal in (source_model.rowsMoved, source_model.layoutChanged, source_model.modelReset):
+            signal.connect(self.source_structure_changed)
+        source_model.rowsAboutToBeRemoved.connect(self.source_rows_about_to_be_removed)
+        source_model.rowsRemoved.connect(self.source_rows_removed)
+        source_model.rowsInserted.connect(self.source_rows_inserted)
+        source_model.dataChanged.connect(self.source_data_changed)
+        self.index_sets()
+        self.apply_filter()
+        self.endResetModel()
+
+    def index(self, row, column, parent=QModelIndex()):
+        if parent.isValid() or row < 0 or row >= len(self.source_rows) or column != 0:
+            return QModelIndex()
+        return self.createIndex(row, column)
+
+    def parent(self, index=None):
+        if index is None:
+            return super(SelectionSetFilterModel, self).parent()
+        return QModelIndex()
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self.source_rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return 1
+
+    def mapToSource(self, proxy_index):
+        if not proxy_index.isValid():
+            return QModelIndex()
+        return self.sourceModel().index(self.source_rows[proxy_index.row()], 0)
+
+    def mapFromSource(self, source_index):
+        if not source_index.isValid() or source_index.row() >= len(self.proxy_rows):
+            return QModelIndex()
+        row = self.proxy_rows[source_index.row()]
+        return self.createIndex(row, 0) if row >= 0 else QModelIndex()
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        self.set_sort('name', order)
+
+    def index_sets(self):
+        """Rebuilds the lowercase search keys of every set"""
+        source_model = self.sourceModel()
+        self.search_keys = {'name': [name.lower() if name else '' for name in source_model.names],
+                            'path': [path.lower() if path else '' for path in source_model.paths]}
+        self.sorted_rows = {}
+
+    def matching_rows(self, candidate_rows):
+        """
+        Filters source rows by the filter text. Every whitespace separated word of the text has to match the name
+        :param candidate_rows: The source rows to check
+        :type candidate_rows: list[int]
+        :return: The rows that pass, in the same order
+        :rtype: list[int]
+        """
+        names = self.search_keys['name']
+        for word in self.filter_text.lower().split():
+            if self.fuzzy:
+                search = re.compile('.*?'.join(re.escape(char) for char in word)).search
+                candidate_rows = [row for row in candidate_rows if search(names[row])]
+            else:
+                candidate_rows = [row for row in candidate_rows if word in names[row]]
+        return candidate_rows
+
+    def apply_filter(self, candidate_rows=None):
+        """
+        Recomputes which sets are shown and in which order
+        :param candidate_rows: Source rows known to hold every set that can pass the filter, e.g. the rows that passed
+                               a shorter filter text. Defaults to every set
+        :type candidate_rows: list[int] | None
+        :return: Nothing
+        :rtype: None
+        """
+        set_count = len(self.search_keys['name'])
+        set_ids = self.sourceModel().set_ids
+        if self.is_identity():
+            self.filtered_rows = self.source_rows = self.proxy_rows = range(set_count)
+            self.proxy_set_ids = array('L', set_ids)
+            return
+
+        self.filtered_rows = list(self.matching_rows(range(set_count) if candidate_rows is None else candidate_rows))
+        if self.sort_key is None:
+            source_rows = list(self.filtered_rows)
+        else:
+            sorted_rows = self.sorted_rows.get(self.sort_key, None)
+            if sorted_rows is None:
+                keys = self.search_keys[self.sort_key]
+                sorted_rows = self.sorted_rows[self.sort_key] = sorted(range(set_count), key=keys.__getitem__)
+            if len(self.filtered_rows) == set_count:
+                source_rows = list(sorted_rows)
+            else:
+                shown = bytearray(set_count)
+                for row in self.filtered_rows:
+                    shown[row] = 1
+                source_rows = [row for row in sorted_rows if shown[row]]
+            if self.sort_order == Qt.DescendingOrder:
+                source_rows.reverse()
+
+        self.source_rows = source_rows
+        self.map_proxy_rows()
+        self.proxy_set_ids = array('L', [set_ids[row] for row in source_rows])
+
+    def is_identity(self):
+        """Returns True if every set is shown in source order, so proxy rows and source rows are the same"""
+        return self.sort_key is None and not self.filter_text.split()
+
+    def map_proxy_rows(self):
+        """Rebuilds the source row to proxy row lookup from source_rows"""
+        proxy_rows = array('l', [-1]) * len(self.search_keys['name'])
+        for proxy_row, source_row in enumerate(self.source_rows):
+            proxy_rows[source_row] = proxy_row
+        self.proxy_rows = proxy_rows
+
+    def sorted_position(self, source_row):
+        """
+        Finds where a set goes among the shown sets under the current sort. Sets with the same key keep source order,
+        as the full sort leaves them
+        :param source_row: The set's source row, which must not be shown yet
+        :type source_row: int
+        :return: The proxy row to insert it at
+        :rtype: int
+        """
+        keys = self.search_keys[self.sort_key]
+        key = (keys[source_row], source_row)
+        descending = self.sort_order == Qt.DescendingOrder
+        source_rows = self.source_rows
+        low, high = 0, len(source_rows)
+        while low < high:
+            middle = (low + high) // 2
+            other_row = source_rows[middle]
+            other_key = (keys[other_row], other_row)
+            if (other_key > key) if descending else (other_key < key):
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def begin_layout_change(self):
+        """
+        Announces a layout change and remembers the set behind every persistent index, while the proxy rows still map
+        to the sets they showed. Does nothing if a change is already open
+        :return: Nothing
+        :rtype: None
+        """
+        if self.layout_changing:
+            return
+        self.layout_changing = True
+        self.layoutAboutToBeChanged.emit()
+        self.persistent_indexes = self.persistentIndexList()
+        self.persistent_ids = [self.proxy_set_ids[index.row()] for index in self.persistent_indexes]
+
+    def end_layout_change(self, candidate_rows=None, reindex=False):
+        """
+        Refilters and resorts the sets, moving the persistent indexes saved by begin_layout_change onto the same sets
+        :param candidate_rows: Passed on to apply_filter
+        :type candidate_rows: list[int] | None
+        :param reindex: Rebuild the search keys first, because sets were added, removed, moved or renamed
+        :type reindex: bool
+        :return: Nothing
+        :rtype: None
+        """
+        if reindex:
+            self.index_sets()
+        self.apply_filter(candidate_rows)
+
+        persistent_indexes, persistent_ids = self.persistent_indexes, self.persistent_ids
+        self.persistent_indexes, self.persistent_ids = [], []
+        if persistent_indexes:
+            source_rows = {set_id: row for row, set_id in enumerate(self.sourceModel().set_ids)}
+            new_indexes = []
+            for index, set_id in zip(persistent_indexes, persistent_ids):
+                source_row = source_rows.get(set_id, None)
+                proxy_row = self.proxy_rows[source_row] if source_row is not None else -1
+                new_indexes.append(self.createIndex(proxy_row, index.column()) if proxy_row >= 0 else QModelIndex())
+            self.changePersistentIndexList(persistent_indexes, new_indexes)
+        self.layout_changing = False
+        self.layoutChanged.emit()
+
+    def relayout(self, candidate_rows=None, reindex=False):
+        """
+        Refilters and resorts the sets, keeping persistent indexes such as the view's selection on the same sets.
+        Inside begin_update this is left to end_update
+        :param candidate_rows: Passed on to apply_filter
+        :type candidate_rows: list[int] | None
+        :param reindex: Rebuild the search keys first, because sets were added, removed, moved or renamed
+        :type reindex: bool
+        :return: Nothing
+        :rtype: None
+        """
+        if self.updating > 0:
+            return
+        self.begin_layout_change()
+        self.end_layout_change(candidate_rows, reindex)
+
+    def begin_update(self):
+        """
+        Holds off refiltering while the source sets go through many changes. Calls can be nested
+        :return: Nothing
+        :rtype: None
+        """
+        if self.updating == 0:
+            self.begin_layout_change()
+        self.updating += 1
+
+    def end_update(self):
+        """
+        Refilters once the last begin_update is closed
+        :return: Nothing
+        :rtype: None
+        """
+        self.updating -= 1
+        if self.updating == 0:
+            self.end_layout_change(reindex=True)
+
+    def set_filter(self, filter_text, fuzzy=None):
+        """
+        Shows only the sets whose name matches
+        :param filter_text: Whitespace separated words, each of which has to be found in the name. Case is ignored
+        :type filter_text: str
+        :param fuzzy: Match the letters of each word in order rather than as a whole. None keeps the current setting
+        :type fuzzy: bool | None
+        :return: Nothing
+        :rtype: None
+        """
+        fuzzy = self.fuzzy if fuzzy is None else fuzzy
+        if filter_text == self.filter_text and fuzzy == self.fuzzy:
+            return
+
+        # Typing more of the same text can only narrow the result down, so only the sets shown now are checked
+        narrowing = fuzzy == self.fuzzy and self.filter_text != '' and filter_text.startswith(self.filter_text)
+        candidate_rows = self.filtered_rows if narrowing else None
+        self.filter_text = filter_text
+        self.fuzzy = fuzzy
+        self.relayout(candidate_rows)
+
+    def set_sort(self, sort_key, order=Qt.AscendingOrder):
+        """
+        Orders the shown sets
+        :param sort_key: One of SORT_KEYS. None shows the sets in scene order
+        :type sort_key: str | None
+        :param order: Qt.AscendingOrder or Qt.DescendingOrder
+        :type order: Qt.SortOrder
+        :return: Nothing
+        :rtype: None
+        """
+        if sort_key not in self.SORT_KEYS:
+            raise ValueError('sort_key must be one of {}. Got: {}'.format(self.SORT_KEYS, sort_key))
+        self.sort_key = sort_key
+        self.sort_order = order
+        self.relayout(self.filtered_rows)
+
+    def source_rows_about_to_be_removed(self, parent, first, last):
+        """
+        Removes the shown sets among the source rows being removed, while the source still holds them. The other sets
+        keep their source rows until source_rows_removed shifts them, so the mapping stays valid throughout
+        """
+        if self.updating > 0 or self.layout_changing:
+            return
+
+        if self.is_identity():
+            set_count = len(self.source_rows)
+            self.beginRemoveRows(QModelIndex(), first, last)
+            del self.proxy_set_ids[first:last + 1]
+            self.source_rows = list(range(first)) + list(range(last + 1, set_count))
+            self.endRemoveRows()
+            return
+
+        proxy_rows = sorted(self.proxy_rows[row] for row in range(first, last + 1) if self.proxy_rows[row] >= 0)
+        # Removed in contiguous proxy runs, bottom up so the runs above keep their rows
+        while proxy_rows:
+            run_last = proxy_rows.pop()
+            run_first = run_last
+            while proxy_rows and proxy_rows[-1] == run_first - 1:
+                run_first = proxy_rows.pop()
+            self.beginRemoveRows(QModelIndex(), run_first, run_last)
+            del self.source_rows[run_first:run_last + 1]
+            del self.proxy_set_ids[run_first:run_last + 1]
+            self.endRemoveRows()
+        del self.filtered_rows[bisect_left(self.filtered_rows, first):bisect_left(self.filtered_rows, last + 1)]
+
+    def source_rows_removed(self, parent, first, last):
+        if self.updating > 0 or self.layout_changing:
+            return
+
+        count = last - first + 1
+        for keys in self.search_keys.values():
+            del keys[first:last + 1]
+        self.sorted_rows = {}
+        if self.is_identity():
+            self.filtered_rows = self.source_rows = self.proxy_rows = range(len(self.search_keys['name']))
+            return
+
+        self.source_rows = [row - count if row > last else row for row in self.source_rows]
+        self.filtered_rows = [row - count if row > last else row for row in self.filtered_rows]
+        self.map_proxy_rows()
+
+    def source_rows_inserted(self, parent, first, last):
+        """
+        Adds the new sets that pass the filter, where the sort puts them. The shown sets are moved onto their new
+        source rows first, so the mapping is valid again before any row is inserted
+        """
+        if self.updating > 0 or self.layout_changing:
+            return
+
+        count = last - first + 1
+        source_model = self.sourceModel()
+        for key, values in (('name', source_model.names), ('path', source_model.paths)):
+            self.search_keys[key][first:first] = [value.lower() if value else '' for value in values[first:last + 1]]
+        self.sorted_rows = {}
+
+        if self.is_identity():
+            self.beginInsertRows(QModelIndex(), first, last)
+            self.proxy_set_ids[first:first] = source_model.set_ids[first:last + 1]
+            self.filtered_rows = self.source_rows = self.proxy_rows = range(len(self.search_keys['name']))
+            self.endInsertRows()
+            return
+
+        self.source_rows = [row + count if row >= first else row for row in self.source_rows]
+        self.filtered_rows = [row + count if row >= first else row for row in self.filtered_rows]
+        new_rows = self.matching_rows(range(first, last + 1))
+        position = bisect_left(self.filtered_rows, first)
+        self.filtered_rows[position:position] = new_rows
+
+        if new_rows and self.sort_key is None:
+            # Unsorted, the new sets are shown together, after the shown sets above them
+            self.beginInsertRows(QModelIndex(), position, position + len(new_rows) - 1)
+            self.source_rows[position:position] = new_rows
+            self.proxy_set_ids[position:position] = array('L', [source_model.set_ids[row] for row in new_rows])
+            self.map_proxy_rows()
+            self.endInsertRows()
+        elif len(new_rows) > self.SORTED_INSERT_LIMIT:
+            self.map_proxy_rows()
+            self.relayout(self.filtered_rows)
+        else:
+            for row in new_rows:
+                position = self.sorted_position(row)
+                self.beginInsertRows(QModelIndex(), position, position)
+                self.source_rows.insert(position, row)
+                self.proxy_set_ids.insert(position, source_model.set_ids[row])
+                self.endInsertRows()
+            self.map_proxy_rows()
+
+    def source_structure_about_to_change(self, *args):
+        if self.updating == 0:
+            self.begin_layout_change()
+
+    def source_structure_changed(self, *args):
+        if self.updating == 0:
+            self.end_layout_change(reindex=True)
+
+    def source_data_changed(self, top_left, bottom_right, roles=()):
+        if self.updating > 0:
+            return
+
+        if not roles or Qt.DisplayRole in roles or SETTINGS__['path'] in roles:
+            source_model = self.sourceModel()
+            for row in range(top_left.row(), bottom_right.row() + 1):
+                name, path = source_model.names[row], source_model.paths[row]
+                self.search_keys['name'][row] = name.lower() if name else ''
+                self.search_keys['path'][row] = path.lower() if path else ''
+            self.sorted_rows = {}
+            if self.filter_text or self.sort_key is not None:
+                self.relayout()
+                return
+
+        proxy_rows = [self.proxy_rows[row] for row in range(top_left.row(), bottom_right.row() + 1)
+                      if self.proxy_rows[row] >= 0]
+        if proxy_rows:
+            self.dataChanged.emit(self.index(min(proxy_rows), 0), self.index(max(proxy_rows), 0), roles)
+
+
+class SelectionAggregate(object):
+    """
+    Running totals of the settings of the selected sets, updated as sets enter and leave the selection so the settings
+    widgets can show a tristate without reading every selected set again
+    """
+
+    def __init__(self):
+        self.contributions = dict()  # type: dict[int, tuple]  # set id to the (path, settings) it was counted with
+        self.checked_counts = dict.fromkeys(INT_SETTINGS__, 0)
+        self.path_counts = Counter()
+
+    def __len__(self):
+        return len(self.contributions)
+
+    def __contains__(self, set_id):
+        return set_id in self.contributions
+
+    def clear(self):
+        self.contributions = dict()
+        self.checked_counts = dict.fromkeys(INT_SETTINGS__, 0)
+        self.path_counts = Counter()
+
+    def add(self, model, row):
+        """
+        Counts a set, replacing what it was counted with before
+        :param model: The model holding the set
+        :type model: SelectionSetModel
+        :param row: The set's row in the model
+        :type row: int
+        :return: Nothing
+        :rtype: None
+        """
+        set_id = model.set_ids[row]
+        self.remove(set_id)
+        path = model.paths[row]
+        values = tuple(model.columns[key][row] for key in INT_SETTINGS__)
+        self.contributions[set_id] = (path, values)
+        self.path_counts[path] += 1
+        for key, value in zip(INT_SETTINGS__, values):
+            if value:
+                self.checked_counts[key] += 1
+
+    def remove(self, set_id):
+        """
+        Stops counting a set. Sets that are not counted are ignored
+        :param set_id: The set's id in its model
+        :type set_id: int
+        :return: Nothing
+        :rtype: None
+        """
+        contribution = self.contributions.pop(set_id, None)
+        if contribution is None:
+            return
+        path, values = contribution
+        self.path_counts[path] -= 1
+        if self.path_counts[path] == 0:
+            del self.path_counts[path]
+        for key, value in zip(INT_SETTINGS__, values):
+            if value:
+                self.checked_counts[key] -= 1
+
+    def common_path(self):
+        """
+        :return: The path every counted set exports to, '' if none of them has one, or None if they differ
+        :rtype: str | None
+        """
+        if len(self.path_counts) != 1:
+            return None
+        return next(iter(self.path_counts)) or ''
+
+    def check_state(self, key):
+        """
+        Gets the tristate of a setting over the counted sets
+        :param key: The setting, one of INT_SETTINGS__
+        :type key: str
+        :return: Qt.Checked if it is on for every set, Qt.Unchecked if it is off for every set, else Qt.PartiallyChecked
+        :rtype: Qt.CheckState
+        """
+        checked = self.checked_counts[key]
+        if checked == 0:
+            return Qt.Unchecked
+        return Qt.Checked if checked == len(self.contributions) else Qt.PartiallyChecked
+
 
 class ObjectExporter(QtWidgets.QWidget):
 
     selection_set_changed_signal = Signal(list)
+    selection_set_delta_signal = Signal(list)
     export_sets_signal = Signal(list)
     ready = Signal()
 
     def __init__(self, *args, **kwargs):
         self.starting_directory = kwargs.pop('starting_directory', None)
+        self.delta_payloads = kwargs.pop('delta_payloads', False)
+        self.export_queue = kwargs.pop('export_queue', None)  # type: ExportJobQueue | None
         super(ObjectExporter, self).__init__(*args, **kwargs)
 
         self.setting_widgets = []
-        self.selection_set_items = []  # type: list[QtGui.QStandardItem]
+        self.applying_scene_data = False
+        self.dirty_selection_sets = dict()  # type: dict[int, set[str]]  # set id to its dirty keys
+        self.previous_names = dict()  # type: dict[int, str]  # set id to its name when changes were last sent
+        self.selection_aggregate = SelectionAggregate()
+
+        # Edits made in the same event loop tick are sent to the DCC as a single payload
+        self.payload_timer = QTimer(self)
+        self.payload_timer.setSingleShot(True)
+        self.payload_timer.setInterval(0)
+        self.payload_timer.timeout.connect(self.emit_selection_set_changes)
 
         self.generate_ui()
 
@@ -69,16 +903,37 @@ class ObjectExporter(QtWidgets.QWidget):
         self.selection_set_layout = QtWidgets.QVBoxLayout()
         self.selection_set_layout.setAlignment(Qt.AlignTop)
 
-        self.selection_set_model = QtGui.QStandardItemModel()
-        self.selection_set_model.appendRow(self.selection_set_items)
-        self.selection_set_model.itemChanged.connect(self.selection_set_changed)
+        self.selection_set_model = SelectionSetModel(self)
+        self.selection_set_model.set_renamed.connect(self.selection_set_renamed)
+        self.selection_set_model.dataChanged.connect(self.selection_set_changed)
+        self.selection_set_model.dataChanged.connect(self.selected_sets_changed)
+        self.selection_set_proxy = SelectionSetFilterModel(self)
+        self.selection_set_proxy.setSourceModel(self.selection_set_model)
 
         self.selection_set_label = QtWidgets.QLabel('Selection Sets:')
+
+        self.filter_line = QtWidgets.QHBoxLayout()
+        self.selection_set_filter = QtWidgets.QLineEdit()
+        self.selection_set_filter.setPlaceholderText('Filter Selection Sets...')
+        self.selection_set_filter.setClearButtonEnabled(True)
+        self.selection_set_filter.textChanged.connect(self.filter_changed)
+        self.fuzzy_filter_chx = QtWidgets.QCheckBox('Fuzzy')
+        self.fuzzy_filter_chx.toggled.connect(self.filter_changed)
+        self.sort_cbx = QtWidgets.QComboBox()
+        self.sort_cbx.addItems(['Scene Order', 'Name', 'Path'])
+        self.sort_cbx.currentIndexChanged.connect(self.sort_changed)
+        self.filter_line.addWidget(self.selection_set_filter)
+        self.filter_line.addWidget(self.fuzzy_filter_chx)
+        self.filter_line.addWidget(self.sort_cbx)
+
         self.selection_set_listview = QtWidgets.QListView()
         self.selection_set_listview.setFlow(QtWidgets.QListView.TopToBottom)
         self.selection_set_listview.setSelectionMode(QtWidgets.QAbstractItemView.ExtendedSelection)
-        self.selection_set_listview.setModel(self.selection_set_model)
+        self.selection_set_listview.setUniformItemSizes(True)
+        self.selection_set_listview.setModel(self.selection_set_proxy)
         self.selection_set_listview.selectionModel().selectionChanged.connect(self.selection_set_clicked)
+        self.selection_set_proxy.layoutChanged.connect(self.recount_selection)
+        self.selection_set_proxy.modelReset.connect(self.recount_selection)
         self.selection_set_listview.setSizePolicy(QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Policy.MinimumExpanding)
 
         self.path_line = QtWidgets.QHBoxLayout()
@@ -92,6 +947,7 @@ class ObjectExporter(QtWidgets.QWidget):
         self.path_line.addWidget(self.browse_button)
 
         self.selection_set_layout.addWidget(self.selection_set_label)
+        self.selection_set_layout.addLayout(self.filter_line)
         self.selection_set_layout.addWidget(self.selection_set_listview)
         self.selection_set_layout.addLayout(self.path_line)
 
@@ -184,51 +1040,35 @@ class ObjectExporter(QtWidgets.QWidget):
         self.export_but.setEnabled(False)
         self.export_but.clicked.connect(self.export_but_clicked)
 
+        self.export_progress_line = QtWidgets.QHBoxLayout()
+        self.export_progress = QtWidgets.QProgressBar()
+        self.export_progress.setFormat('%v / %m sets exported')
+        self.export_progress.setVisible(False)
+        self.cancel_export_but = QtWidgets.QPushButton('Cancel')
+        self.cancel_export_but.setVisible(False)
+        self.cancel_export_but.clicked.connect(self.cancel_export)
+        self.export_progress_line.addWidget(self.export_progress)
+        self.export_progress_line.addWidget(self.cancel_export_but)
+
+        if self.export_queue is not None:
+            self.export_queue.progress_changed.connect(self.export_progress_changed)
+            self.export_queue.queue_finished.connect(self.export_finished)
+
         # Main Widget
         main_layout.addLayout(self.selection_set_layout)
         main_layout.addWidget(BoxLayoutSeparator(QtWidgets.QFrame.HLine))
         main_layout.addLayout(settings_widget_layout)
         main_layout.addWidget(self.export_but)
+        main_layout.addLayout(self.export_progress_line)
 
         self.setLayout(main_layout)
 
-    @staticmethod
-    def scene_data_to_standard_items(scene_data):
-        """
-        Takes in the json data from the scene and translates it into QStandardItems for consumption
-        :param scene_data: A list of set dictionaries
-        :type scene_data: list
-        :return: A list of QStandardItems
-        :rtype: list
-        """
-        standard_items = []
-        for item in scene_data:  # type: dict
-            if not hasattr(item, 'get'):
-                continue
-            new_item = QtGui.QStandardItem(item.get('name', None))
-            new_item.setEditable(False)
-
-            path = abspath(item['path']) if 'path' in item else None
-            new_item.setData(path, role=SETTINGS__['path'])
-
-            new_item.setData(item.get('smoothing_groups', 0), role=SETTINGS__['smoothing_groups'])
-            new_item.setData(item.get('triangulate', 0), role=SETTINGS__['triangulate'])
-            new_item.setData(item.get('turbosmooth', 0), role=SETTINGS__['turbosmooth'])
-            new_item.setData(item.get('tanbi', 0), role=SETTINGS__['tanbi'])
-            new_item.setData(item.get('svn', 0), role=SETTINGS__['svn'])
-            new_item.setData(item.get('skinning', 0), role=SETTINGS__['skinning'])
-            new_item.setData(item.get('sceneup', 0), role=SETTINGS__['sceneup'])
-            new_item.setData(item.get('origin', 0), role=SETTINGS__['origin'])
-
-            standard_items.append(new_item)
-        return standard_items
-
     @staticmethod
     def standard_item_to_scene_data(standard_item):
         """
-        Takes in a QStandardItem and creates an export dict from the Items various UserRoles
-        :param standard_item: The QStandardItem we want to translate
-        :type standard_item: QtGui.QStandardItem
+        Takes in a set's index and creates an export dict from the index's various UserRoles
+        :param standard_item: The index of the set we want to translate
+        :type standard_item: QModelIndex
         :return: The translated dictionary with all the payload data
         :rtype: dict
         """
@@ -248,51 +1088,75 @@ class ObjectExporter(QtWidgets.QWidget):
     @staticmethod
     def create_default_selection_set(set_name):
         """
-        Creates a StandardItem with the given name and all default values. Adds this to the end of the list, then
+        Creates the export dict of a new set with the given name and all default values
         :param set_name: The name we want the new set to have
         :type set_name: str
-        :return: The resultant QStandardItem
-        :rtype: QtGui.QStandardItem
+        :return: The set's settings, keyed like SETTINGS__
+        :rtype: dict
         """
-        new_item = QtGui.QStandardItem(set_name)
-        new_item.setEditable(False)
-
-        new_item.setData('', role=SETTINGS__['path'])
-
-        new_item.setData(0, role=SETTINGS__['smoothing_groups'])
-        new_item.setData(0, role=SETTINGS__['triangulate'])
-        new_item.setData(0, role=SETTINGS__['turbosmooth'])
-        new_item.setData(0, role=SETTINGS__['tanbi'])
-        new_item.setData(0, role=SETTINGS__['svn'])
-        new_item.setData(0, role=SETTINGS__['skinning'])
-        new_item.setData(0, role=SETTINGS__['sceneup'])
-        new_item.setData(0, role=SETTINGS__['origin'])
-
-        return new_item
+        default_set = dict.fromkeys(INT_SETTINGS__, 0)
+        default_set['name'] = set_name
+        default_set['path'] = ''
+        return default_set
 
     def get_named_selection_set(self, set_name):
         """
         Gets a selection set based on its name
         :param set_name: The name of the selection set to grab
         :type set_name: str
-        :return: The selection set we have found or None
-        :rtype: QtGui.QStandardItem | None
+        :return: The index of the selection set we have found or None
+        :rtype: QModelIndex | None
         """
-        for sel_set in self.selection_set_items:
-            if sel_set.data(role=Qt.DisplayRole) == set_name:
-                return sel_set
-        return None
+        row = self.selection_set_model.row_of(set_name)
+        return self.selection_set_model.index(row, 0) if row is not None else None
 
     def export_but_clicked(self, *args):
         """
-        This sends the selected selection sets to the DCC to perform its export procedures.
+        This sends the selected selection sets to the DCC to perform its export procedures. With an export queue, the
+        sets are exported on the queue's workers instead and export_sets_signal is not sent
         :return: Nothing
         :rtype: None
         """
+        if self.export_queue is not None:
+            self.export_queue.submit([self.selection_set_model.scene_data(row) for row in self.selected_rows()])
+            return
+
         selected_indexes = self.selection_set_listview.selectionModel().selectedIndexes()
-        selected_sets = [self.selection_set_model.data(ind, role=Qt.DisplayRole) for ind in selected_indexes]
+        selected_sets = [self.selection_set_proxy.data(ind, role=Qt.DisplayRole) for ind in selected_indexes]
         self.export_sets_signal.emit(selected_sets)
 
+    def export_progress_changed(self, finished, total):
+        """
+        Callback for when the export queue finishes or queues a job
+        :param finished: How many jobs have finished
+        :type finished: int
+        :param total: How many jobs were submitted
+        :type total: int
+        :return: Nothing
+        :rtype: None
+        """
+        self.export_progress.setFormat('%v / %m sets exported')
+        self.export_progress.setMaximum(total)
+        self.export_progress.setValue(finished)
+        self.export_progress.setVisible(True)
+        self.cancel_export_but.setVisible(True)
+
+    def export_finished(self, summary):
+        """
+        Callback for when the export queue has run every job
+        :param summary: The queue's summary of the exports
+        :type summary: dict
+        :return: Nothing
+        :rtype: None
+        """
+        self.cancel_export_but.setVisible(False)
+        self.export_progress.setFormat('{} exported, {} unchanged, {} failed, {} cancelled'.format(
+            len(summary['succeeded']), len(summary['cached']), len(summary['failed']), len(summary['cancelled'])))
+
+    def cancel_export(self, *args):
+        if self.export_queue is not None:
+            self.export_queue.cancel()
+
     def browse_button_clicked(self, *args):
         browser = QtWidgets.QFileDialog(parent=self, caption='Browse for Export Path...', directory=self.starting_directory)
         browser.setFileMode(QtWidgets.QFileDialog.Directory)
@@ -300,14 +1164,64 @@ class ObjectExporter(QtWidgets.QWidget):
         self.selection_set_path.setText((browser.getExistingDirectory()).replace('/', '\\'))
         self.selection_set_path.editingFinished.emit()
 
-    def selection_set_clicked(self, *args):
+    def selection_set_clicked(self, selected=None, deselected=None):
         """
-        Callback for when the current selection in the list is changed
+        Callback for when the current selection in the list is changed. Only the sets entering and leaving the
+        selection are counted in or out of the selection aggregate
+        :param selected: The proxy ranges added to the selection
+        :type selected: QtCore.QItemSelection
+        :param deselected: The proxy ranges removed from the selection
+        :type deselected: QtCore.QItemSelection
         :return: Nothing
         :rtype: None
         """
-        selected_indexes = self.selection_set_listview.selectionModel().selectedIndexes()
-        if len(selected_indexes) == 0:
+        if selected is None or deselected is None:
+            self.recount_selection()
+            return
+
+        proxy_set_ids, source_rows = self.selection_set_proxy.proxy_set_ids, self.selection_set_proxy.source_rows
+        for selection_range in deselected:
+            for row in range(selection_range.top(), selection_range.bottom() + 1):
+                self.selection_aggregate.remove(proxy_set_ids[row])
+        for selection_range in selected:
+            for row in range(selection_range.top(), selection_range.bottom() + 1):
+                self.selection_aggregate.add(self.selection_set_model, source_rows[row])
+        self.update_setting_widgets()
+
+    def recount_selection(self, *args):
+        """
+        Counts the selected sets again from scratch, for when the list changed under the selection
+        :return: Nothing
+        :rtype: None
+        """
+        self.selection_aggregate.clear()
+        for row in self.selected_rows():
+            self.selection_aggregate.add(self.selection_set_model, row)
+        self.update_setting_widgets()
+
+    def selected_sets_changed(self, top_left, bottom_right, roles=()):
+        """
+        Callback for when sets change in the model, recounting the ones that are selected
+        :param top_left: The first changed index
+        :type top_left: QModelIndex
+        :param bottom_right: The last changed index
+        :type bottom_right: QModelIndex
+        :return: Nothing
+        :rtype: None
+        """
+        set_ids = self.selection_set_model.set_ids
+        for row in range(top_left.row(), bottom_right.row() + 1):
+            if set_ids[row] in self.selection_aggregate:
+                self.selection_aggregate.add(self.selection_set_model, row)
+
+    def update_setting_widgets(self):
+        """
+        Shows the settings of the selected sets on the settings widgets
+        :return: Nothing
+        :rtype: None
+        """
+        selected_count = len(self.selection_aggregate)
+        if selected_count == 0:
             self.export_but.setEnabled(False)
 
             self.selection_set_path.blockSignals(True)
@@ -319,12 +1233,12 @@ class ObjectExporter(QtWidgets.QWidget):
                 widget.setEnabled(False)
                 widget.blockSignals(True)
 
-        elif len(selected_indexes) == 1:
-            ind = selected_indexes[0]
+        elif selected_count == 1:
+            ind = self.selection_set_listview.selectionModel().selectedIndexes()[0]
             self.export_but.setEnabled(True)
 
             self.selection_set_path.blockSignals(True)
-            self.selection_set_path.setText(self.selection_set_model.data(ind, role=SETTINGS__['path']))
+            self.selection_set_path.setText(self.selection_set_proxy.data(ind, role=SETTINGS__['path']))
             self.selection_set_path.blockSignals(False)
 
             for widget in self.setting_widgets:  # type: QtWidgets.QWidget
@@ -333,21 +1247,21 @@ class ObjectExporter(QtWidgets.QWidget):
 
                 name = widget.objectName()
                 if isinstance(widget, TristateCheckbox):
-                    state_int = self.selection_set_model.data(ind, role=SETTINGS__[name])
+                    state_int = self.selection_set_proxy.data(ind, role=SETTINGS__[name])
                     state = Qt.Unchecked if state_int == 0 else Qt.Checked
                     widget.setCheckState(state)
                 elif isinstance(widget, QtWidgets.QComboBox):
-                    widget.setCurrentIndex(self.selection_set_model.data(ind, role=SETTINGS__[name]))
+                    widget.setCurrentIndex(self.selection_set_proxy.data(ind, role=SETTINGS__[name]))
 
                 widget.blockSignals(False)
 
-        elif len(selected_indexes) > 1:
+        elif selected_count > 1:
             self.export_but.setEnabled(True)
 
             self.selection_set_path.blockSignals(True)
-            paths = [self.selection_set_model.data(ind, role=SETTINGS__['path']) for ind in selected_indexes]
-            if all(path == paths[0] for path in paths):
-                self.selection_set_path.setText(paths[0])
+            common_path = self.selection_aggregate.common_path()
+            if common_path is not None:
+                self.selection_set_path.setText(common_path)
             else:
                 self.selection_set_path.setText('Multiple Paths')
             self.selection_set_path.blockSignals(False)
@@ -359,40 +1273,213 @@ class ObjectExporter(QtWidgets.QWidget):
                 name = widget.objectName()
 
                 if isinstance(widget, TristateCheckbox):
-                    states_ints = [self.selection_set_model.data(ind, role=SETTINGS__[name]) for ind in selected_indexes]
-                    states = [Qt.Unchecked if state_int == 0 else Qt.Checked for state_int in states_ints]
-
-                    if all(state == states[0] for state in states):
-                        widget.setCheckState(states[0])
-                    else:
-                        widget.setCheckState(Qt.PartiallyChecked)
+                    widget.setCheckState(self.selection_aggregate.check_state(name))
 
                 widget.blockSignals(False)
 
     def scene_data_changed(self, set_data):
         """
-        Used by the calling, DCC dialog to push new selection set data to this dialog
+        Used by the calling, DCC dialog to push new selection set data to this dialog. The incoming sets are diffed
+        against the current ones: removed sets lose their rows, new sets are inserted, moved sets are moved and only
+        the settings that differ are written to existing sets
         :param set_data: a list of dicts
         :type set_data: list
         :return: Nothing
         :rtype: None
         """
-        self.selection_set_items = self.scene_data_to_standard_items(set_data)
-        self.selection_set_model.clear()
-        for item in self.selection_set_items:
-            self.selection_set_model.appendRow(item)
+        self.apply_scene_data([set_data])
 
-    def selection_set_changed(self, *args):
+    def apply_scene_data(self, chunks):
         """
-        Callback that happens when the dialog updates some data on the QStandardItem. Then we emit the payload back to
-        the DCC
-        :param args: The QStandardItem that has been changed
-        :type args: QtGui.QStandardItem
+        Diffs the incoming sets against the current ones a chunk at a time, so a chunk can be applied as soon as it is
+        read. Each chunk updates the sets already in the dialog and appends its new sets as a single insert. Once every
+        chunk is in, the sets missing from the scene lose their rows and the rest are moved into scene order
+        :param chunks: Lists of scene data dicts, in scene order
+        :type chunks: Iterable[list[dict]]
         :return: Nothing
         :rtype: None
         """
-        scene_dicts = [self.standard_item_to_scene_data(item) for item in self.selection_set_items]
-        self.selection_set_changed_signal.emit(scene_dicts)
+        model = self.selection_set_model
+        incoming_names = set()
+        order = []
+        self.applying_scene_data = True
+        self.selection_set_proxy.begin_update()
+        try:
+            for chunk in chunks:
+                new_sets = []
+                for item in chunk:
+                    if not hasattr(item, 'get') or item.get('name', None) in incoming_names:
+                        continue
+                    name = item.get('name', None)
+                    incoming_names.add(name)
+                    order.append(name)
+                    row = model.row_of(name)
+                    if row is None:
+                        new_sets.append(item)
+                    else:
+                        model.update_set(row, item)
+                model.insert_sets(len(model.names), new_sets)
+
+            removed_rows = sorted((row for name, row in model.rows.items() if name not in incoming_names),
+                                  reverse=True)
+            while removed_rows:
+                last = first = removed_rows.pop(0)
+                while removed_rows and removed_rows[0] == first - 1:
+                    first = removed_rows.pop(0)
+                model.removeRows(first, last - first + 1)
+
+            # Sets already in increasing row order stay put; every other set is moved to sit right after the set that
+            # precedes it in the new order. Loading a scene into an empty dialog moves nothing
+            stable = longest_increasing_run([model.row_of(name) for name in order])
+            for position, name in enumerate(order):
+                if position in stable:
+                    continue
+                target = model.row_of(order[position - 1]) + 1 if position > 0 else 0
+                model.move_set(model.row_of(name), target)
+        finally:
+            self.selection_set_proxy.end_update()
+            self.applying_scene_data = False
+
+    def filter_changed(self, *args):
+        """
+        Callback for when the filter text or the fuzzy checkbox is changed by the user
+        :return: Nothing
+        :rtype: None
+        """
+        self.selection_set_proxy.set_filter(self.selection_set_filter.text(), fuzzy=self.fuzzy_filter_chx.isChecked())
+
+    def sort_changed(self, *args):
+        """
+        Callback for when the sort order is changed by the user
+        :return: Nothing
+        :rtype: None
+        """
+        self.selection_set_proxy.set_sort(SelectionSetFilterModel.SORT_KEYS[self.sort_cbx.currentIndex()])
+
+    def scene_json_changed(self, payload):
+        """
+        Used by the calling, DCC dialog to push the selection set json it holds in the scene straight to this dialog
+        :param payload: The json text, or a file holding it. Files are read one set at a time and applied
+                        SCENE_CHUNK_SIZE__ sets at a time
+        :type payload: str | io.TextIOBase
+        :return: Nothing
+        :rtype: None
+        :raises SceneDataCodec.SceneDataError: The payload does not match the schema. The sets of a file read before
+                                               the error are still applied, but no set is removed or moved
+        """
+        if hasattr(payload, 'read'):
+            scene_items = SceneDataCodec.iter_decode(payload)
+            self.apply_scene_data(iter(lambda: list(islice(scene_items, SCENE_CHUNK_SIZE__)), []))
+        else:
+            self.scene_data_changed(SceneDataCodec.decode(payload))
+
+    def get_scene_json(self, as_list=False):
+        """
+        Builds the json the DCC stores in the scene from every set in the dialog
+        :param as_list: Write a list of sets instead of the dict keyed by set name
+        :type as_list: bool
+        :return: The json text
+        :rtype: str
+        """
+        return SceneDataCodec.encode(self.selection_set_model.all_scene_data(), as_list=as_list, check=False)
+
+    def selection_set_changed(self, top_left, bottom_right, roles=()):
+        """
+        Callback that happens when the dialog updates some data on the selection sets. The changed sets and settings are
+        marked dirty and the payload is sent back to the DCC on the next event loop tick, so a burst of edits goes out
+        as one payload
+        :param top_left: The first changed index
+        :type top_left: QModelIndex
+        :param bottom_right: The last changed index
+        :type bottom_right: QModelIndex
+        :param roles: The roles that changed. Empty means every role
+        :type roles: list[int]
+        :return: Nothing
+        :rtype: None
+        """
+        if self.applying_scene_data:
+            return
+
+        keys = set(SETTING_ROLES__[role] for role in roles if role in SETTING_ROLES__) if roles else set(SETTINGS__)
+        if not keys:
+            return
+
+        set_ids = self.selection_set_model.set_ids
+        for row in range(top_left.row(), bottom_right.row() + 1):
+            self.dirty_selection_sets.setdefault(set_ids[row], set()).update(keys)
+        self.payload_timer.start()
+
+    def selection_set_renamed(self, set_id, previous_name):
+        """
+        Remembers the name a renamed set had when changes were last sent, so its delta can say which set it replaces
+        :param set_id: The renamed set's id in the model
+        :type set_id: int
+        :param previous_name: The name it had before this rename
+        :type previous_name: str
+        :return: Nothing
+        :rtype: None
+        """
+        if not self.applying_scene_data:
+            self.previous_names.setdefault(set_id, previous_name)
+
+    def emit_selection_set_changes(self):
+        """
+        Sends the pending changes to the DCC. By default this is every set, through selection_set_changed_signal. With
+        delta_payloads on, only the changed settings of the changed sets are sent, through selection_set_delta_signal.
+        The patch of a renamed set also holds its old name under 'previous_name', so the DCC can drop the old entry
+        :return: Nothing
+        :rtype: None
+        """
+        self.payload_timer.stop()
+        dirty_sets, self.dirty_selection_sets = self.dirty_selection_sets, dict()
+        previous_names, self.previous_names = self.previous_names, dict()
+        if not dirty_sets:
+            return
+
+        model = self.selection_set_model
+        if not self.delta_payloads:
+            self.selection_set_changed_signal.emit(model.all_scene_data())
+            return
+
+        patches = []
+        for row, set_id in enumerate(model.set_ids):
+            keys = dirty_sets.get(set_id, None)
+            if keys is None:
+                continue
+            patch = {key: model.value(row, key) for key in keys}
+            patch['name'] = model.names[row]
+            previous_name = previous_names.get(set_id, None)
+            if previous_name is not None and previous_name != patch['name']:
+                patch['previous_name'] = previous_name
+            patches.append(patch)
+        self.selection_set_delta_signal.emit(patches)
+
+    def selected_rows(self):
+        """
+        Gets the rows of the selected sets in the set model, whatever the filter and sort order
+        :return: The rows, sorted
+        :rtype: list[int]
+        """
+        source_rows = self.selection_set_proxy.source_rows
+        selected_indexes = self.selection_set_listview.selectionModel().selectedIndexes()
+        return sorted(set(source_rows[ind.row()] for ind in selected_indexes))
+
+    def apply_setting(self, key, value, rows=None):
+        """
+        Applies one setting to many sets as a single transaction: the model announces the edit once per run of
+        neighbouring rows and the DCC receives a single payload once every set is written
+        :param key: The setting, a key of SETTINGS__ other than 'name'
+        :type key: str
+        :param value: The new value
+        :type value: str | int
+        :param rows: The rows of the sets to edit. Defaults to the selected sets
+        :type rows: list[int] | None
+        :return: Nothing
+        :rtype: None
+        """
+        rows = self.selected_rows() if rows is None else rows
+        if self.selection_set_model.set_values(rows, key, value):
+            self.emit_selection_set_changes()
 
     def setting_changed(self, *args):
         """
@@ -400,17 +1487,15 @@ class ObjectExporter(QtWidgets.QWidget):
         :return: Nothing
         :rtype: None
         """
-        for ind in self.selection_set_listview.selectedIndexes():
-            self.selection_set_model.setData(ind, args[0], role=SETTINGS__[self.sender().objectName()])
+        self.apply_setting(self.sender().objectName(), args[0])
 
     def selection_set_path_changed(self, *args):
         """
         Callback for when the export path is changed on the dialog by the user
-        :return:
-        :rtype:
+        :return: Nothing
+        :rtype: None
         """
-        for ind in self.selection_set_listview.selectedIndexes():
-            self.selection_set_model.setData(ind, self.selection_set_path.text(), role=SETTINGS__['path'])
+        self.apply_setting('path', self.selection_set_path.text())
 
     def create_selection_set(self, set_name):
         """
@@ -420,10 +1505,10 @@ class ObjectExporter(QtWidgets.QWidget):
         :return: Nothing
         :rtype: None
         """
-        new_item = self.create_default_selection_set(set_name)
-        self.selection_set_items.append(new_item)
-        self.selection_set_model.clear()
-        self.selection_set_model.appendColumn(self.selection_set_items)
+        model = self.selection_set_model
+        if model.row_of(set_name) is not None:
+            return
+        model.insert_sets(model.rowCount(), [self.create_default_selection_set(set_name)])
 
     def remove_selection_set(self, set_name):
         """
@@ -433,17 +1518,10 @@ class ObjectExporter(QtWidgets.QWidget):
         :return: Nothing
         :rtype: None
         """
-        index = 0
-        for ind, item in enumerate(self.selection_set_items):
-            if item.data(role=Qt.DisplayRole) == set_name:
-                index = ind
-                break
-
-        sel_set = self.selection_set_items.pop(index)
-        del sel_set
-
-        self.selection_set_model.clear()
-        self.selection_set_model.appendColumn(self.selection_set_items)
+        row = self.selection_set_model.row_of(set_name)
+        if row is None:
+            return
+        self.selection_set_model.removeRow(row)
 
     def rename_selection_set(self, set_name, new_name):
         """
@@ -452,11 +1530,10 @@ class ObjectExporter(QtWidgets.QWidget):
         :type set_name: str
         :param new_name: The new name to set for the set
         :type new_name: str
-        :return: Nothing
-        :rtype: None
+        :return: Whether the set was renamed. False if there is no set of that name or another set has new_name
+        :rtype: bool
         """
-        sel_set = self.get_named_selection_set(set_name)
-        if sel_set is None:
-            return
-        sel_set.setData(new_name, role=Qt.DisplayRole)
-
+        row = self.selection_set_model.row_of(set_name)
+        if row is None:
+            return False
+        return self.selection_set_model.setData(self.selection_set_model.index(row, 0), new_name, role=Qt.DisplayRole)
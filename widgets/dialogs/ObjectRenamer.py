@@ -5,52 +5,441 @@ This tool should only take in a List of strings and return a List of strings
 """
 
 from PySide2 import QtWidgets, QtGui
-from PySide2.QtCore import Qt, QModelIndex, Signal
-import math
+from PySide2.QtCore import Qt, QModelIndex, QAbstractTableModel, QObject, QRunnable, QThreadPool, QTimer, Signal
+from gui.dialogs.RenamePlan import RenamePlan, RenameCollisionIndex, SEARCH_MODES
+from gui.dialogs.RenameHistory import RenameHistory
+import re
+
+
+# What do_rename does with names that are not unique: emit them anyway, refuse to rename, or number the repeats.
+# Anything but 'ignore' computes every new name up front to find the collisions
+COLLISION_MODES = ['ignore', 'block', 'resolve']
+
+
+class RenameSelectionModel(QAbstractTableModel):
+    """
+    A two column table model backed by a plain list of the current names. The New Name column is never stored; it is
+    computed from the current rename settings whenever a view asks for a row, so only visible rows are ever built.
+    """
+
+    headers = ['Current Name', 'New Name']
+
+    def __init__(self, parent=None):
+        super(RenameSelectionModel, self).__init__(parent)
+
+        self.current_names = []  # type: list[str]
+        self.preview_names = []  # type: list[str]
+        self.rename_plan = RenamePlan()
+        self.collision_index = RenameCollisionIndex()
+        self.track_collisions = False
+        self.collision_brush = QtGui.QBrush(QtGui.QColor(220, 60, 60))
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self.current_names)
+
+    def columnCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self.headers)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return self.headers[section]
+        return None
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        row = index.row()
+        if role == Qt.DisplayRole:
+            if index.column() == 0:
+                return self.current_names[row]
+            if row < len(self.preview_names):
+                return self.preview_names[row]
+            return self.new_name(row)
+        if role in (Qt.ForegroundRole, Qt.ToolTipRole) and index.column() == 1 and row < len(self.preview_names):
+            if self.collision_index.is_colliding(self.preview_names[row]):
+                return self.collision_brush if role == Qt.ForegroundRole else 'This name is not unique'
+        return None
 
+    def add_data(self, selection_data):
+        """
+        Appends a single row to the end of the model
+        :param selection_data: The string of the currently selected item for this index
+        :type selection_data: str
+        :return: Nothing
+        :rtype: None
+        """
+        row = len(self.current_names)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self.current_names.append(selection_data)
+        self.reset_preview()
+        self.endInsertRows()
+
+    def set_names(self, names):
+        """
+        Replaces every row of the model with the given names in a single reset
+        :param names: The current names to display
+        :type names: list[str]
+        :return: Nothing
+        :rtype: None
+        """
+        self.beginResetModel()
+        self.current_names = list(names)
+        self.reset_preview()
+        self.endResetModel()
+
+    def update_names(self, names):
+        """
+        Brings the model in line with the given names using the smallest set of row removals, a single reorder if the
+        surviving rows changed order, and row insertions. Views keep their selection and scroll position
+        :param names: The current names to display
+        :type names: list[str]
+        :return: Nothing
+        :rtype: None
+        """
+        names = list(names)
+        if names == self.current_names:
+            return
+
+        self.reset_preview()
+        old_keys = self._row_keys(self.current_names)
+        new_keys = self._row_keys(names)
+        new_key_set = set(new_keys)
+
+        # Remove the rows that have left the selection, bottom up, one range at a time
+        row = len(old_keys) - 1
+        while row >= 0:
+            if old_keys[row] in new_key_set:
+                row -= 1
+                continue
+            last = row
+            while row >= 0 and old_keys[row] not in new_key_set:
+                row -= 1
+            self.beginRemoveRows(QModelIndex(), row + 1, last)
+            del self.current_names[row + 1:last + 1]
+            del old_keys[row + 1:last + 1]
+            self.endRemoveRows()
+
+        # Put the surviving rows in their new relative order
+        old_key_set = set(old_keys)
+        kept_keys = [key for key in new_keys if key in old_key_set]
+        if kept_keys != old_keys:
+            self._reorder(old_keys, kept_keys)
+
+        # Insert the rows that have joined the selection, top down, one range at a time
+        row = 0
+        while row < len(new_keys):
+            if new_keys[row] in old_key_set:
+                row += 1
+                continue
+            first = row
+            while row < len(new_keys) and new_keys[row] not in old_key_set:
+                row += 1
+            self.beginInsertRows(QModelIndex(), first, row - 1)
+            self.current_names[first:first] = names[first:row]
+            self.endInsertRows()
+
+    @staticmethod
+    def _row_keys(names):
+        """
+        Pairs every name with its occurrence count so duplicated short names can still be told apart
+        :param names: The names to key
+        :type names: list[str]
+        :return: A (name, occurrence) tuple per name
+        :rtype: list[tuple[str, int]]
+        """
+        occurrences = dict()
+        keys = []
+        for name in names:
+            occurrence = occurrences.get(name, 0)
+            occurrences[name] = occurrence + 1
+            keys.append((name, occurrence))
+        return keys
+
+    def _reorder(self, old_keys, new_keys):
+        """
+        Reorders the rows in a single layout change, moving persistent indexes along with their rows
+        :param old_keys: The current row keys
+        :type old_keys: list[tuple[str, int]]
+        :param new_keys: The same keys in their new order
+        :type new_keys: list[tuple[str, int]]
+        :return: Nothing
+        :rtype: None
+        """
+        self.layoutAboutToBeChanged.emit()
 
-class RenameSelectionModel(QtGui.QStandardItemModel):
-    def __init__(self, rows, columns, parent=None):
-        super(RenameSelectionModel, self).__init__(rows, columns, parent)
+        new_rows = {key: row for row, key in enumerate(new_keys)}
+        old_indexes = self.persistentIndexList()
+        new_indexes = [self.index(new_rows[old_keys[ind.row()]], ind.column()) for ind in old_indexes]
+        self.current_names = [name for name, _ in new_keys]
+        self.changePersistentIndexList(old_indexes, new_indexes)
 
-        self.parent_item = self.invisibleRootItem()
+        self.layoutChanged.emit()
 
-        self.headers = ['Current Name', 'New Name']
+    def clear(self):
+        """
+        Removes every row from the model
+        :return: Nothing
+        :rtype: None
+        """
+        if not self.current_names:
+            return
+        self.beginRemoveRows(QModelIndex(), 0, len(self.current_names) - 1)
+        self.current_names = []
+        self.reset_preview()
+        self.endRemoveRows()
+
+    def set_rename_plan(self, rename_plan):
+        """
+        Stores the plan used to build the New Name column and invalidates that whole column with one signal
+        :param rename_plan: The rename settings to display
+        :type rename_plan: RenamePlan
+        :return: Nothing
+        :rtype: None
+        """
+        self.rename_plan = rename_plan
+        self.reset_preview()
 
-        for ind, col_name in enumerate(self.headers):
-            self.setHeaderData(ind, Qt.Horizontal, col_name)
+        row_count = len(self.current_names)
+        if row_count > 0:
+            self.dataChanged.emit(self.index(0, 1), self.index(row_count - 1, 1), [Qt.DisplayRole])
 
-    def add_data(self, selection_data):
+    def new_name(self, row):
         """
-        Adds an item into each header of the model with the appropraite data
-        :param selection_data: The string of the currently selected item for this index
-        :type selection_data: str
+        Computes the new name for a single row from the current rename plan
+        :param row: The row to compute the name for
+        :type row: int
+        :return: The new name
+        :rtype: str
+        """
+        return self.rename_plan.rename(self.current_names[row], row, len(self.current_names))
+
+    def reset_preview(self):
+        """
+        Drops every precomputed new name, along with the collision index built over them
+        :return: Nothing
+        :rtype: None
+        """
+        self.preview_names = []
+        if self.track_collisions:
+            self.collision_index.reset(self.current_names)
+
+    def add_preview_chunk(self, start, names):
+        """
+        Stores a block of precomputed new names. Blocks must arrive in row order
+        :param start: The row of the first name in the block
+        :type start: int
+        :param names: The new names for the block
+        :type names: list[str]
+        :return: Nothing
+        :rtype: None
+        """
+        if start != len(self.preview_names):
+            raise ValueError('Preview chunk starts at row {}, expected row {}'.format(start, len(self.preview_names)))
+        self.preview_names.extend(names)
+        self._index_preview(names)
+
+    def complete_preview(self):
+        """
+        Computes every row the preview has not reached yet, in one pass
+        :return: Nothing
+        :rtype: None
+        """
+        start = len(self.preview_names)
+        if start < len(self.current_names):
+            names = self.rename_plan.apply(self.current_names[start:], start=start, count=len(self.current_names))
+            self.preview_names.extend(names)
+            self._index_preview(names)
+
+    def _index_preview(self, names):
+        """
+        Adds newly precomputed names to the collision index. A new name can make earlier rows collide too, so every
+        precomputed row is repainted with a single signal
+        :param names: The names just added to the preview
+        :type names: list[str]
+        :return: Nothing
+        :rtype: None
+        """
+        if not self.track_collisions or not names:
+            return
+        self.collision_index.add(names)
+        self.dataChanged.emit(self.index(0, 1), self.index(len(self.preview_names) - 1, 1),
+                              [Qt.ForegroundRole, Qt.ToolTipRole])
+
+    def new_names(self):
+        """
+        Gets every new name without going through Qt, computing any rows the preview has not reached yet
+        :return: A snapshot of the new names, in row order
+        :rtype: list[str]
+        """
+        self.complete_preview()
+        return list(self.preview_names)
+
+    def is_preview_complete(self):
+        """Returns True if every row has a precomputed new name"""
+        return len(self.preview_names) == len(self.current_names)
+
+
+class RenamePreviewSignals(QObject):
+    """
+    QRunnable is not a QObject, so the preview worker reports back through this
+    """
+
+    chunk_ready = Signal(int, int, list)  # job id, first row, new names
+    finished = Signal(int)  # job id, sent once the worker has stopped
+
+
+class RenamePreviewWorker(QRunnable):
+    """
+    Computes new names on a QThreadPool thread, one chunk at a time, until it finishes or is cancelled. The finished
+    signal is sent either way so the owner knows when it can let go of the worker
+    """
+
+    def __init__(self, job_id, rename_plan, names, chunk_size=10000):
+        """
+        :param job_id: Sent back with every result so stale jobs can be ignored
+        :type job_id: int
+        :param rename_plan: The settings to rename with
+        :type rename_plan: RenamePlan
+        :param names: A snapshot of the current names
+        :type names: tuple[str]
+        :param chunk_size: How many names to compute between progress reports and cancellation checks
+        :type chunk_size: int
+        """
+        super(RenamePreviewWorker, self).__init__()
+        self.setAutoDelete(False)
+
+        self.job_id = job_id
+        self.rename_plan = rename_plan
+        self.names = names
+        self.chunk_size = max(1, chunk_size)
+        self.cancelled = False
+
+        self.signals = RenamePreviewSignals()
+
+    def cancel(self):
+        self.cancelled = True
+
+    def run(self):
+        count = len(self.names)
+        for start in range(0, count, self.chunk_size):
+            if self.cancelled:
+                break
+            chunk = self.rename_plan.apply(self.names[start:start + self.chunk_size], start=start, count=count)
+            self.signals.chunk_ready.emit(self.job_id, start, chunk)
+
+        self.signals.finished.emit(self.job_id)
+
+
+class RecomputeScheduler(QObject):
+    """
+    Coalesces bursts of requests into a single call of the callback. With an interval of 0 the callback runs once on
+    the next event loop tick; with a positive interval it runs once the requests have been idle for that many
+    milliseconds.
+    """
+
+    pending_changed = Signal(bool)
+
+    def __init__(self, callback, interval=0, parent=None):
+        super(RecomputeScheduler, self).__init__(parent)
+
+        self.callback = callback
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(interval)
+        self._timer.timeout.connect(self._run)
+
+    @property
+    def interval(self):
+        return self._timer.interval()
+
+    @interval.setter
+    def interval(self, value):
+        self._timer.setInterval(value)
+
+    def is_pending(self):
+        """Returns True if a call of the callback is waiting to run"""
+        return self._timer.isActive()
+
+    def schedule(self):
+        """
+        Requests a call of the callback. Requests made before it runs are merged into the same call
+        :return: Nothing
+        :rtype: None
+        """
+        was_pending = self.is_pending()
+        if was_pending and self.interval == 0:
+            return
+
+        self._timer.start()
+        if not was_pending:
+            self.pending_changed.emit(True)
+
+    def flush(self):
+        """
+        Runs a pending call of the callback immediately
         :return: Nothing
         :rtype: None
         """
-        current_name_column = QtGui.QStandardItem()
-        current_name_column.setData(selection_data, Qt.DisplayRole)
-        current_name_column.setEditable(False)
+        if self.is_pending():
+            self._timer.stop()
+            self._run()
 
-        new_name_column = QtGui.QStandardItem()
-        new_name_column.setData('New Name', Qt.DisplayRole)
-        new_name_column.setEditable(False)
+    def _run(self):
+        self.callback()
+        self.pending_changed.emit(False)
 
-        self.appendRow([current_name_column, new_name_column])
+    def cancel(self):
+        """
+        Drops a pending call of the callback without running it
+        :return: Nothing
+        :rtype: None
+        """
+        if self.is_pending():
+            self._timer.stop()
+            self.pending_changed.emit(False)
 
 
 class ObjectRenamer(QtWidgets.QWidget):
 
     renamed = Signal(list)
+    rename_blocked = Signal(list)
+    undone = Signal(list, list)  # names the objects have now, names to give them back
+    redone = Signal(list, list)  # names the objects have now, names to rename them to
     ready = Signal()
+    preview_pending_changed = Signal(bool)
 
     def __init__(self, *args, **kwargs):
+        recompute_interval = kwargs.pop('recompute_interval', 0)
+        existing_names = kwargs.pop('existing_names', None)
+        history_budget = kwargs.pop('history_budget', 32 * 1024 * 1024)
+        self.collision_mode = kwargs.pop('collision_mode', 'ignore')
+        if self.collision_mode not in COLLISION_MODES:
+            raise ValueError('collision_mode must be one of {}. Got: {}'.format(COLLISION_MODES, self.collision_mode))
+        self.threaded_preview_threshold = kwargs.pop('threaded_preview_threshold', None)
+        self.preview_chunk_size = kwargs.pop('preview_chunk_size', 10000)
         super(ObjectRenamer, self).__init__(*args, **kwargs)
 
         self.selected_items = []
+        self.history = RenameHistory(memory_budget=history_budget)
+
+        self.thread_pool = QThreadPool.globalInstance()
+        self.preview_worker = None  # type: RenamePreviewWorker | None
+        self.preview_job_id = 0
+        self.running_preview_workers = dict()  # type: dict[int, RenamePreviewWorker]
+
+        self.recompute_scheduler = RecomputeScheduler(self.create_new_name, recompute_interval, self)
+        self.recompute_scheduler.pending_changed.connect(self.preview_pending_changed)
 
         self.generate_ui()
 
+        if existing_names is not None:
+            self.list_model.collision_index.set_existing_names(existing_names)
+
     def dialog_opened(self):
         self.ready.emit()
 
@@ -67,13 +456,34 @@ class ObjectRenamer(QtWidgets.QWidget):
 
         lineedit_grp = []
 
+        self.search_chx = QtWidgets.QCheckBox()
+        self.search_chx.stateChanged.connect(self.checkbox_cycled)
+        search_label = QtWidgets.QLabel('Search:')
+        self.search_le = QtWidgets.QLineEdit()
+        self.search_le.setEnabled(False)
+        self.search_le.textChanged.connect(self.request_new_name)
+        lineedit_grp.append((self.search_chx, search_label, self.search_le))
+
+        replace_label = QtWidgets.QLabel('Replace:')
+        self.replace_le = QtWidgets.QLineEdit()
+        self.replace_le.setEnabled(False)
+        self.replace_le.textChanged.connect(self.request_new_name)
+        lineedit_grp.append((QtWidgets.QWidget(), replace_label, self.replace_le))
+
+        search_mode_label = QtWidgets.QLabel('Search Mode:')
+        self.search_mode_cbx = QtWidgets.QComboBox()
+        self.search_mode_cbx.addItems([mode.capitalize() for mode in SEARCH_MODES])
+        self.search_mode_cbx.setEnabled(False)
+        self.search_mode_cbx.currentIndexChanged.connect(self.request_new_name)
+        lineedit_grp.append((QtWidgets.QWidget(), search_mode_label, self.search_mode_cbx))
+
         # self.prefix_chx = QtWidgets.QCheckBox()
         self.prefix_chx = QtWidgets.QCheckBox()
         self.prefix_chx.stateChanged.connect(self.checkbox_cycled)
         prefix_label = QtWidgets.QLabel('Prefix:')
         self.prefix_le = QtWidgets.QLineEdit()
         self.prefix_le.setEnabled(False)
-        self.prefix_le.textChanged.connect(self.create_new_name)
+        self.prefix_le.textChanged.connect(self.request_new_name)
         lineedit_grp.append((self.prefix_chx, prefix_label, self.prefix_le))
 
         self.base_name_chx = QtWidgets.QCheckBox()
@@ -81,7 +491,7 @@ class ObjectRenamer(QtWidgets.QWidget):
         base_name_label = QtWidgets.QLabel('Base Name:')
         self.base_name_le = QtWidgets.QLineEdit()
         self.base_name_le.setEnabled(False)
-        self.base_name_le.textChanged.connect(self.create_new_name)
+        self.base_name_le.textChanged.connect(self.request_new_name)
         lineedit_grp.append((self.base_name_chx, base_name_label, self.base_name_le))
 
         self.side_chx = QtWidgets.QCheckBox()
@@ -89,7 +499,7 @@ class ObjectRenamer(QtWidgets.QWidget):
         side_label = QtWidgets.QLabel('Side:')
         self.side_le = QtWidgets.QLineEdit()
         self.side_le.setEnabled(False)
-        self.side_le.textChanged.connect(self.create_new_name)
+        self.side_le.textChanged.connect(self.request_new_name)
         lineedit_grp.append((self.side_chx, side_label, self.side_le))
 
         self.suffix_chx = QtWidgets.QCheckBox()
@@ -97,7 +507,7 @@ class ObjectRenamer(QtWidgets.QWidget):
         suffix_label = QtWidgets.QLabel('Suffix:')
         self.suffix_le = QtWidgets.QLineEdit()
         self.suffix_le.setEnabled(False)
-        self.suffix_le.textChanged.connect(self.create_new_name)
+        self.suffix_le.textChanged.connect(self.request_new_name)
         lineedit_grp.append((self.suffix_chx, suffix_label, self.suffix_le))
 
         self.separator_chx = QtWidgets.QCheckBox()
@@ -106,7 +516,7 @@ class ObjectRenamer(QtWidgets.QWidget):
         self.separator_le = QtWidgets.QLineEdit()
         self.separator_le.setEnabled(False)
         self.separator_le.setText('_')
-        self.separator_le.textChanged.connect(self.create_new_name)
+        self.separator_le.textChanged.connect(self.request_new_name)
         lineedit_grp.append((self.separator_chx, separator_label, self.separator_le))
 
         self.numeration_chx = QtWidgets.QCheckBox()
@@ -115,26 +525,26 @@ class ObjectRenamer(QtWidgets.QWidget):
         self.numeration_sb = QtWidgets.QSpinBox()
         self.numeration_sb.setEnabled(False)
         self.numeration_sb.setValue(2)
-        self.numeration_sb.valueChanged.connect(self.create_new_name)
+        self.numeration_sb.valueChanged.connect(self.request_new_name)
         lineedit_grp.append((self.numeration_chx, numeration_label, self.numeration_sb))
 
         num_start_label = QtWidgets.QLabel('Start Number:')
         self.num_start_sb = QtWidgets.QSpinBox()
         self.num_start_sb.setEnabled(False)
         self.num_start_sb.setValue(1)
-        self.num_start_sb.valueChanged.connect(self.create_new_name)
+        self.num_start_sb.valueChanged.connect(self.request_new_name)
         lineedit_grp.append((QtWidgets.QWidget(), num_start_label, self.num_start_sb))
 
         remove_first_label = QtWidgets.QLabel("Remove First:")
         self.remove_first_sb = QtWidgets.QSpinBox()
         self.remove_first_sb.setValue(0)
-        self.remove_first_sb.valueChanged.connect(self.create_new_name)
+        self.remove_first_sb.valueChanged.connect(self.request_new_name)
         lineedit_grp.append((QtWidgets.QWidget(), remove_first_label, self.remove_first_sb))
 
         remove_last_label = QtWidgets.QLabel("Remove Last:")
         self.remove_last_sb = QtWidgets.QSpinBox()
         self.remove_last_sb.setValue(0)
-        self.remove_last_sb.valueChanged.connect(self.create_new_name)
+        self.remove_last_sb.valueChanged.connect(self.request_new_name)
         lineedit_grp.append((QtWidgets.QWidget(), remove_last_label, self.remove_last_sb))
 
         for ind, (chx, label, le) in enumerate(lineedit_grp):
@@ -145,19 +555,43 @@ class ObjectRenamer(QtWidgets.QWidget):
         del lineedit_grp
 
         # Selection Model
-        self.list_model = RenameSelectionModel(0, 2, self)
+        self.list_model = RenameSelectionModel(self)
+        self.list_model.track_collisions = self.collision_mode != 'ignore'
 
         # Selection Listview
         item_treeview = QtWidgets.QTreeView()
         item_treeview.setModel(self.list_model)
 
-        # Rename Button
-        rename_but = QtWidgets.QPushButton('Rename')
-        rename_but.clicked.connect(self.do_rename)
+        # Preview Progress
+        self.preview_progress = QtWidgets.QProgressBar()
+        self.preview_progress.setTextVisible(False)
+        self.preview_progress.setMaximumHeight(6)
+        self.preview_progress.setVisible(False)
+
+        # Collision Warning
+        self.collision_label = QtWidgets.QLabel()
+        self.collision_label.setStyleSheet('color: rgb(220, 60, 60)')
+        self.collision_label.setVisible(False)
+
+        # Rename Buttons
+        rename_layout = QtWidgets.QHBoxLayout()
+        self.rename_but = QtWidgets.QPushButton('Rename')
+        self.rename_but.clicked.connect(self.do_rename)
+        self.undo_but = QtWidgets.QPushButton('Undo')
+        self.undo_but.setEnabled(False)
+        self.undo_but.clicked.connect(self.undo)
+        self.redo_but = QtWidgets.QPushButton('Redo')
+        self.redo_but.setEnabled(False)
+        self.redo_but.clicked.connect(self.redo)
+        rename_layout.addWidget(self.rename_but, 1)
+        rename_layout.addWidget(self.undo_but)
+        rename_layout.addWidget(self.redo_but)
 
         main_layout.addLayout(editline_grid)
         main_layout.addWidget(item_treeview)
-        main_layout.addWidget(rename_but)
+        main_layout.addWidget(self.preview_progress)
+        main_layout.addWidget(self.collision_label)
+        main_layout.addLayout(rename_layout)
 
         self.setLayout(main_layout)
 
@@ -167,39 +601,35 @@ class ObjectRenamer(QtWidgets.QWidget):
         :return: Nothing
         :rtype: None
         """
-        self.list_model.beginRemoveRows(QModelIndex(), 0, self.list_model.rowCount())
-
-        self.list_model.removeRows(0, self.list_model.rowCount())
-
-        self.list_model.endRemoveRows()
+        self.cancel_preview()
+        self.list_model.clear()
 
     def selection_changed(self, selection_list):
         """
-        The current DCC selection has been changed. Invalidate the current list, empty it, and remake the listview
+        The current DCC selection has been changed. Only the rows that differ from the current list are inserted,
+        removed or moved
         :param selection_list: A list containing the short names for all selected objects, in the order they were
                                 selected
         :type selection_list: list[str]
         :return: Nothing
         :rtype: None
         """
-        self.clear_selection_list()
+        self.cancel_preview()
         self.selected_items = selection_list
+        self.list_model.update_names(self.selected_items)
 
-        self.list_model.beginInsertRows(QModelIndex(), 0, len(self.selected_items)-1)
-
-        for item in self.selected_items:
-            self.list_model.add_data(item)
-
-        self.list_model.endInsertRows()
-
-        self.create_new_name()
+        self.request_new_name()
 
     def checkbox_cycled(self, *args):
         sender = self.sender()
         state = bool(args[0])
 
         lineedit = []
-        if sender == self.prefix_chx:
+        if sender == self.search_chx:
+            lineedit.append(self.search_le)
+            lineedit.append(self.replace_le)
+            lineedit.append(self.search_mode_cbx)
+        elif sender == self.prefix_chx:
             lineedit.append(self.prefix_le)
         elif sender == self.base_name_chx:
             lineedit.append(self.base_name_le)
@@ -216,49 +646,158 @@ class ObjectRenamer(QtWidgets.QWidget):
         for le in lineedit:
             le.setEnabled(state)
 
-        self.create_new_name()
+        self.request_new_name()
 
     def get_new_names(self):
         """
-        Queries the list and gathers all the New Names, returning a list of them
+        Gathers all the New Names straight from the model's name list, returning a list of them
         :return: A list of all the new names
         :rtype: list[str]
         """
-        new_names = [None] * self.list_model.rowCount()
-        for i in range(self.list_model.rowCount()):
-            new_name_index = self.list_model.index(i, 1)
-            new_names[i] = self.list_model.data(new_name_index, Qt.DisplayRole)
-        return new_names
+        self.recompute_scheduler.flush()
+        return self.list_model.new_names()
+
+    def get_rename_plan(self):
+        """
+        Gathers the current state of the rename widgets into a RenamePlan
+        :return: The rename settings currently shown in the dialog
+        :rtype: RenamePlan
+        """
+        search = self.search_le.text() if self.search_le.isEnabled() else ''
+        search_mode = SEARCH_MODES[self.search_mode_cbx.currentIndex()]
+        replace = self.replace_le.text()
+
+        try:
+            RenamePlan(search=search, replace=replace, search_mode=search_mode).validate()
+        except (re.error, IndexError) as error:
+            self.search_le.setStyleSheet('border: 1px solid rgb(220, 60, 60)')
+            self.search_le.setToolTip(str(error))
+            search = ''
+        else:
+            self.search_le.setStyleSheet('')
+            self.search_le.setToolTip('')
+
+        return RenamePlan(prefix=self.prefix_le.text() if self.prefix_le.isEnabled() else '',
+                          base_name=self.base_name_le.text() if self.base_name_le.isEnabled() else '',
+                          side=self.side_le.text() if self.side_le.isEnabled() else '',
+                          suffix=self.suffix_le.text() if self.suffix_le.isEnabled() else '',
+                          separator=self.separator_le.text() if self.separator_le.isEnabled() else '',
+                          numeration=self.numeration_sb.isEnabled(),
+                          numeration_digits=self.numeration_sb.value(),
+                          start_number=self.num_start_sb.value(),
+                          remove_first=self.remove_first_sb.value(),
+                          remove_last=self.remove_last_sb.value(),
+                          search=search,
+                          replace=replace,
+                          search_mode=search_mode)
+
+    def is_preview_pending(self):
+        """Returns True if a rename setting has changed and the New Name column has not been refreshed yet"""
+        return self.recompute_scheduler.is_pending()
+
+    def request_new_name(self, *args):
+        """
+        Schedules a refresh of the New Name column. Bursts of setting changes are merged into a single refresh
+        :return: Nothing
+        :rtype: None
+        """
+        self.recompute_scheduler.schedule()
 
     def create_new_name(self):
-        base_name = self.base_name_le.text() if self.base_name_le.isEnabled() else ''
-        prefix = self.prefix_le.text() if self.prefix_le.isEnabled() else ''
-        suffix = self.suffix_le.text() if self.suffix_le.isEnabled() else ''
-        side = self.side_le.text() if self.side_le.isEnabled() else ''
-        separator = self.separator_le.text() if self.separator_le.isEnabled() else ''
+        """
+        Pushes the current rename settings to the model. New names are only computed for rows the view displays,
+        unless the selection is large enough to precompute them all on a background thread
+        :return: Nothing
+        :rtype: None
+        """
+        self.cancel_preview()
+        self.list_model.set_rename_plan(self.get_rename_plan())
 
-        row_digits = int(math.log10(self.list_model.rowCount()))+1 if self.list_model.rowCount() > 0 else 0
-        numeration_digits = self.numeration_sb.value() if self.numeration_sb.value() > row_digits else row_digits
+        row_count = self.list_model.rowCount()
+        if self.threaded_preview_threshold is not None and row_count >= self.threaded_preview_threshold:
+            self.start_preview()
+        elif self.list_model.track_collisions:
+            self.list_model.complete_preview()
+        self.update_collision_label()
 
-        for i in range(self.list_model.rowCount()):
-            current_name_index = self.list_model.index(i, 0)
-            new_name_index = self.list_model.index(i, 1)
-            current_name = self.list_model.data(current_name_index, Qt.DisplayRole)
+    def start_preview(self):
+        """
+        Starts computing every new name on the thread pool, streaming the results into the model
+        :return: Nothing
+        :rtype: None
+        """
+        self.preview_job_id += 1
+        self.preview_worker = RenamePreviewWorker(self.preview_job_id, self.list_model.rename_plan,
+                                                  tuple(self.list_model.current_names), self.preview_chunk_size)
+        self.preview_worker.signals.chunk_ready.connect(self.preview_chunk_ready)
+        self.preview_worker.signals.finished.connect(self.preview_finished)
+        self.running_preview_workers[self.preview_job_id] = self.preview_worker
 
-            new_base_name = base_name if base_name != '' else current_name
-            new_prefix = '{}{}'.format(prefix, separator) if prefix != '' else ''
-            new_side = '{}{}'.format(separator, side) if side != '' else ''
-            new_suffix = '{}{}'.format(separator, suffix) if suffix != '' else ''
+        self.preview_progress.setRange(0, self.list_model.rowCount())
+        self.preview_progress.setValue(0)
+        self.preview_progress.setVisible(True)
 
-            number = str(i+self.num_start_sb.value()).zfill(numeration_digits)
-            number = '{}{}'.format(separator, number) if numeration_digits > 0 else number
-            number = number if self.numeration_sb.isEnabled() else ''
+        self.thread_pool.start(self.preview_worker)
 
-            final_name = '{}{}{}{}{}'.format(new_prefix, new_base_name, new_side, new_suffix, number)
+    def cancel_preview(self):
+        """
+        Stops the in-flight preview job, if any. Results it has already queued are ignored
+        :return: Nothing
+        :rtype: None
+        """
+        if self.preview_worker is None:
+            return
+        self.preview_worker.cancel()
+        self.preview_worker = None
+        self.preview_progress.setVisible(False)
+
+    def is_preview_running(self):
+        """Returns True if new names are being computed on the thread pool"""
+        return self.preview_worker is not None
+
+    def preview_chunk_ready(self, job_id, start, names):
+        if self.preview_worker is None or job_id != self.preview_worker.job_id:
+            return
+        self.list_model.add_preview_chunk(start, names)
+        self.preview_progress.setValue(start + len(names))
+
+    def preview_finished(self, job_id):
+        self.running_preview_workers.pop(job_id, None)
+        if self.preview_worker is None or job_id != self.preview_worker.job_id:
+            return
+        self.preview_worker = None
+        self.preview_progress.setVisible(False)
+        self.update_collision_label()
+
+    def set_existing_names(self, existing_names):
+        """
+        Gives the dialog every name currently in the scene, so new names that are already taken are flagged too
+        :param existing_names: The short names of every object in the scene
+        :type existing_names: list[str]
+        :return: Nothing
+        :rtype: None
+        """
+        self.list_model.collision_index.set_existing_names(existing_names)
+        self.request_new_name()
 
-            final_name = final_name[self.remove_first_sb.value():len(final_name)-self.remove_last_sb.value()]
+    def update_collision_label(self):
+        """
+        Shows how many new names are not unique, once every row has been previewed
+        :return: Nothing
+        :rtype: None
+        """
+        if not self.list_model.track_collisions or not self.list_model.is_preview_complete():
+            self.collision_label.setVisible(False)
+            return
+
+        collision_count = len(self.list_model.collision_index.collisions())
+        if collision_count == 0:
+            self.collision_label.setVisible(False)
+            return
 
-            self.list_model.setData(new_name_index, final_name, Qt.DisplayRole)
+        action = 'They will be numbered on rename.' if self.collision_mode == 'resolve' else 'Rename is blocked.'
+        self.collision_label.setText('{} new names are not unique. {}'.format(collision_count, action))
+        self.collision_label.setVisible(True)
 
     def do_rename(self):
         """
@@ -266,6 +805,48 @@ class ObjectRenamer(QtWidgets.QWidget):
         :return: Nothing
         :rtype: None
         """
-        self.renamed.emit(self.get_new_names())
+        self.recompute_scheduler.flush()
+        if self.is_preview_running():
+            self.cancel_preview()
+
+        new_names = self.get_new_names()
+        if self.list_model.track_collisions:
+            collisions = self.list_model.collision_index.collisions()
+            if collisions and self.collision_mode == 'block':
+                self.rename_blocked.emit(collisions)
+                return
+            if collisions:
+                new_names = self.list_model.collision_index.resolve(new_names, self.list_model.rename_plan.separator)
+
+        self.history.record(self.list_model.current_names, new_names)
+        self.update_history_buttons()
+
+        self.renamed.emit(new_names)
         self.clear_selection_list()
         self.ready.emit()
+
+    def undo(self):
+        """
+        Reverts the last rename batch, emitting undone with the mapping the DCC should apply
+        :return: Nothing
+        :rtype: None
+        """
+        mapping = self.history.undo()
+        self.update_history_buttons()
+        if mapping is not None:
+            self.undone.emit(*mapping)
+
+    def redo(self):
+        """
+        Reapplies the last undone rename batch, emitting redone with the mapping the DCC should apply
+        :return: Nothing
+        :rtype: None
+        """
+        mapping = self.history.redo()
+        self.update_history_buttons()
+        if mapping is not None:
+            self.redone.emit(*mapping)
+
+    def update_history_buttons(self):
+        self.undo_but.setEnabled(self.history.can_undo())
+        self.redo_but.setEnabled(self.history.can_redo())
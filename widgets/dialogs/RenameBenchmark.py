@@ -0,0 +1,296 @@
+"""
+Benchmarks for the ObjectRenamer dialog, runnable headless on the offscreen Qt platform.
+
+The dialog suite feeds synthetic DCC selections through selection_changed, create_new_name, get_new_names and
+do_rename, reporting wall time, peak Python memory and the number of model signals emitted by each step. The engine
+suite compares the rename engine against the per-row QStandardItemModel path the dialog used to take.
+
+    python -m gui.dialogs.RenameBenchmark --sizes 1000 10000 100000 500000 --output rename_bench.json
+    python -m gui.dialogs.RenameBenchmark --engine --sizes 1000 10000 100000
+"""
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+import PySide2
+from PySide2 import QtWidgets, QtGui
+from PySide2.QtCore import Qt
+from gui.dialogs.ObjectRenamer import ObjectRenamer
+from gui.dialogs.RenamePlan import RenamePlan
+
+
+DEFAULT_SIZES = [1000, 10000, 100000]
+DIALOG_SIZES = [1000, 10000, 100000, 500000]
+
+# The model signals counted for every dialog step
+MODEL_SIGNALS = ['dataChanged', 'rowsInserted', 'rowsRemoved', 'rowsMoved', 'layoutChanged', 'modelReset']
+
+BENCHMARK_SETTINGS = {'prefix': 'L',
+                      'side': 'l',
+                      'suffix': 'jnt',
+                      'separator': '_',
+                      'numeration': True,
+                      'numeration_digits': 2,
+                      'start_number': 1,
+                      'remove_first': 0,
+                      'remove_last': 0}
+
+
+def synthetic_names(count):
+    """
+    Builds a list of DCC style short names
+    :param count: How many names to build
+    :type count: int
+    :return: The names
+    :rtype: list[str]
+    """
+    return ['pCube{}'.format(i) for i in range(count)]
+
+
+def synthetic_selection(count):
+    """
+    Builds a selection shaped like a rigging scene: sided, numbered joints and controls
+    :param count: How many names to build
+    :type count: int
+    :return: The names, in selection order
+    :rtype: list[str]
+    """
+    sides = ['L', 'R', 'C']
+    parts = ['arm', 'leg', 'spine', 'finger', 'neck']
+    kinds = ['jnt', 'ctrl', 'grp']
+    return ['{}_{}{:03d}_{}'.format(sides[i % 3], parts[i % 5], i // 15, kinds[i % 3]) for i in range(count)]
+
+
+class SignalCounter(object):
+    """
+    Counts the emissions of every model signal in MODEL_SIGNALS
+    """
+
+    def __init__(self, model):
+        self.counts = dict.fromkeys(MODEL_SIGNALS, 0)
+        for name in MODEL_SIGNALS:
+            getattr(model, name).connect(lambda *args, signal_name=name: self._count(signal_name))
+
+    def _count(self, name):
+        self.counts[name] += 1
+
+    def take(self):
+        """
+        Gets the counts since the last call and starts counting from zero again
+        :return: The emissions per signal name
+        :rtype: dict[str, int]
+        """
+        counts = self.counts
+        self.counts = dict.fromkeys(MODEL_SIGNALS, 0)
+        return counts
+
+
+def dialog_steps(renamer, names):
+    """
+    The operations a user goes through in a rename, in order
+    :param renamer: The dialog to drive
+    :type renamer: ObjectRenamer
+    :param names: The synthetic selection
+    :type names: list[str]
+    :return: (step name, callable) pairs
+    :rtype: list[tuple[str, callable]]
+    """
+    def select():
+        renamer.selection_changed(names)
+        renamer.recompute_scheduler.flush()
+
+    def grow_selection():
+        renamer.selection_changed(names + ['extra_selected_node'])
+        renamer.recompute_scheduler.flush()
+
+    def change_settings():
+        for widget, value in ((renamer.prefix_chx, True), (renamer.separator_chx, True),
+                              (renamer.numeration_chx, True)):
+            widget.setChecked(value)
+        renamer.prefix_le.setText('rig')
+        renamer.create_new_name()
+        renamer.recompute_scheduler.cancel()
+
+    def regex_search():
+        renamer.search_chx.setChecked(True)
+        renamer.search_mode_cbx.setCurrentIndex(2)
+        renamer.search_le.setText(r'(\w+?)(\d+)_(jnt|ctrl|grp)')
+        renamer.replace_le.setText(r'\1_\3_\2')
+        renamer.create_new_name()
+        renamer.recompute_scheduler.cancel()
+
+    return [('selection_changed', select),
+            ('selection_changed_incremental', grow_selection),
+            ('create_new_name', change_settings),
+            ('create_new_name_regex', regex_search),
+            ('get_new_names', renamer.get_new_names),
+            ('do_rename', renamer.do_rename)]
+
+
+def benchmark_dialog(sizes=None, measure_memory=True):
+    """
+    Runs every dialog step for every selection size. Timings come from a clean run; peak memory is measured in a
+    second run under tracemalloc, which would otherwise distort the timings
+    :param sizes: The selection sizes to run
+    :type sizes: list[int]
+    :param measure_memory: Should peak memory be measured?
+    :type measure_memory: bool
+    :return: One dict per size and step
+    :rtype: list[dict]
+    """
+    sizes = sizes or DIALOG_SIZES
+    app = QtWidgets.QApplication.instance() or QtWidgets.QApplication(sys.argv)
+
+    results = []
+    for size in sizes:
+        names = synthetic_selection(size)
+
+        renamer = ObjectRenamer()
+        counter = SignalCounter(renamer.list_model)
+        for step, run in dialog_steps(renamer, names):
+            start = time.perf_counter()
+            run()
+            elapsed = time.perf_counter() - start
+            results.append({'size': size, 'step': step, 'seconds': elapsed, 'peak_bytes': None,
+                            'signals': counter.take()})
+        renamer.deleteLater()
+
+        if measure_memory:
+            renamer = ObjectRenamer()
+            size_results = [result for result in results if result['size'] == size]
+            tracemalloc.start()
+            for result, (step, run) in zip(size_results, dialog_steps(renamer, names)):
+                tracemalloc.reset_peak()
+                baseline = tracemalloc.get_traced_memory()[0]
+                run()
+                result['peak_bytes'] = tracemalloc.get_traced_memory()[1] - baseline
+            tracemalloc.stop()
+            renamer.deleteLater()
+
+        app.processEvents()
+    return results
+
+
+def environment_info():
+    """
+    Describes the machine the benchmark ran on, so results from different runs can be compared fairly
+    :return: The environment description
+    :rtype: dict
+    """
+    return {'timestamp': datetime.datetime.now().isoformat(),
+            'python': platform.python_version(),
+            'pyside2': PySide2.__version__,
+            'platform': platform.platform(),
+            'processor': platform.processor()}
+
+
+def legacy_per_row_rename(names, settings):
+    """
+    Renames through a QStandardItemModel one row at a time, the way ObjectRenamer.create_new_name used to
+    :param names: The current names
+    :type names: list[str]
+    :param settings: The keyword arguments of a RenamePlan
+    :type settings: dict
+    :return: The new names
+    :rtype: list[str]
+    """
+    model = QtGui.QStandardItemModel(0, 2)
+    for name in names:
+        model.appendRow([QtGui.QStandardItem(name), QtGui.QStandardItem('New Name')])
+
+    plan = RenamePlan(**settings)
+    prefix, base_name, side, suffix, separator = plan.prefix, plan.base_name, plan.side, plan.suffix, plan.separator
+    numeration_digits = plan.digits_for(model.rowCount())
+
+    for i in range(model.rowCount()):
+        current_name = model.data(model.index(i, 0), Qt.DisplayRole)
+
+        new_base_name = base_name if base_name != '' else current_name
+        new_prefix = '{}{}'.format(prefix, separator) if prefix != '' else ''
+        new_side = '{}{}'.format(separator, side) if side != '' else ''
+        new_suffix = '{}{}'.format(separator, suffix) if suffix != '' else ''
+
+        number = str(i + plan.start_number).zfill(numeration_digits)
+        number = '{}{}'.format(separator, number) if numeration_digits > 0 else number
+        number = number if plan.numeration else ''
+
+        final_name = '{}{}{}{}{}'.format(new_prefix, new_base_name, new_side, new_suffix, number)
+        final_name = final_name[plan.remove_first:len(final_name) - plan.remove_last]
+
+        model.setData(model.index(i, 1), final_name, Qt.DisplayRole)
+
+    return [model.data(model.index(i, 1), Qt.DisplayRole) for i in range(model.rowCount())]
+
+
+def benchmark_engine(sizes=None, settings=None):
+    """
+    Times RenamePlan.apply against the legacy per-row path for every size
+    :param sizes: The selection sizes to run
+    :type sizes: list[int]
+    :param settings: The keyword arguments of a RenamePlan
+    :type settings: dict
+    :return: One dict per size with the timings in seconds
+    :rtype: list[dict]
+    """
+    sizes = sizes or DEFAULT_SIZES
+    settings = settings or BENCHMARK_SETTINGS
+    app = QtWidgets.QApplication.instance() or QtWidgets.QApplication(sys.argv)
+
+    results = []
+    for size in sizes:
+        names = synthetic_names(size)
+
+        start = time.perf_counter()
+        engine_names = RenamePlan(**settings).apply(names)
+        engine_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        legacy_names = legacy_per_row_rename(names, settings)
+        legacy_time = time.perf_counter() - start
+
+        if engine_names != legacy_names:
+            raise RuntimeError('RenamePlan output differs from the per-row path at size {}'.format(size))
+
+        results.append({'size': size, 'engine': engine_time, 'per_row': legacy_time})
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark the ObjectRenamer dialog')
+    parser.add_argument('--sizes', type=int, nargs='+', help='The selection sizes to run')
+    parser.add_argument('--engine', action='store_true', help='Compare the rename engine with the per-row path instead')
+    parser.add_argument('--no-memory', action='store_true', help='Skip the peak memory run')
+    parser.add_argument('--output', help='Write the results to this JSON file')
+    args = parser.parse_args(sys.argv[1:] if argv is None else argv)
+
+    if args.engine:
+        results = benchmark_engine(args.sizes)
+        print('{:>10} {:>12} {:>12} {:>9}'.format('names', 'engine (s)', 'per-row (s)', 'speedup'))
+        for result in results:
+            speedup = result['per_row'] / result['engine'] if result['engine'] else float('inf')
+            print('{:>10} {:>12.4f} {:>12.4f} {:>8.1f}x'.format(result['size'], result['engine'], result['per_row'],
+                                                              speedup))
+    else:
+        results = benchmark_dialog(args.sizes, measure_memory=not args.no_memory)
+        print('{:>8} {:<30} {:>10} {:>12} {:>8}'.format('names', 'step', 'time (s)', 'peak (KiB)', 'signals'))
+        for result in results:
+            peak = '-' if result['peak_bytes'] is None else '{:.0f}'.format(result['peak_bytes'] / 1024.0)
+            print('{:>8} {:<30} {:>10.4f} {:>12} {:>8}'.format(result['size'], result['step'], result['seconds'], peak,
+                                                               sum(result['signals'].values())))
+
+    if args.output:
+        with open(args.output, 'w') as output_file:
+            json.dump({'suite': 'engine' if args.engine else 'dialog', 'environment': environment_info(),
+                       'results': results}, output_file, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,179 @@
+"""
+A bounded undo/redo history of rename batches for the ObjectRenamer dialog. Nothing in here touches Qt.
+
+Every batch keeps the new names in full, since those are what the objects are called in the scene after the rename.
+The old names are stored as a delta against the new ones: how many leading and trailing characters they share, plus
+the differing middle as an index into a table of shared tokens. Adding a prefix to 20k objects therefore stores the
+20k old names as three integer arrays and a single empty token.
+"""
+
+import sys
+from array import array
+
+
+class RenameBatch(object):
+    """
+    One rename operation, stored compactly
+    """
+
+    __slots__ = ('new_names', 'heads', 'tails', 'middles', 'tokens', 'memory')
+
+    def __init__(self, old_names, new_names):
+        """
+        :param old_names: The names before the rename
+        :type old_names: list[str]
+        :param new_names: The names after the rename, in the same order
+        :type new_names: list[str]
+        """
+        if len(old_names) != len(new_names):
+            raise ValueError('Got {} old names for {} new names'.format(len(old_names), len(new_names)))
+
+        self.new_names = tuple(new_names)
+        self.heads = array('I')
+        self.tails = array('I')
+        self.middles = array('I')
+        self.tokens = []
+
+        token_ids = dict()
+        for old_name, new_name in zip(old_names, self.new_names):
+            head = self.shared_head(old_name, new_name)
+            tail = self.shared_tail(old_name, new_name, head)
+            middle = old_name[head:len(old_name) - tail]
+
+            token_id = token_ids.get(middle)
+            if token_id is None:
+                token_id = token_ids[middle] = len(self.tokens)
+                self.tokens.append(middle)
+
+            self.heads.append(head)
+            self.tails.append(tail)
+            self.middles.append(token_id)
+
+        self.memory = self.measure()
+
+    def __len__(self):
+        return len(self.new_names)
+
+    @staticmethod
+    def shared_head(first, second):
+        """Returns how many leading characters two strings share"""
+        length = min(len(first), len(second))
+        if first[:length] == second[:length]:
+            return length
+        head = 0
+        while first[head] == second[head]:
+            head += 1
+        return head
+
+    @staticmethod
+    def shared_tail(first, second, head=0):
+        """Returns how many trailing characters two strings share, without overlapping the shared head"""
+        length = min(len(first), len(second)) - head
+        tail = 0
+        while tail < length and first[-1 - tail] == second[-1 - tail]:
+            tail += 1
+        return tail
+
+    def measure(self):
+        """
+        Estimates the bytes this batch holds on to
+        :return: The size in bytes
+        :rtype: int
+        """
+        size = sys.getsizeof(self.new_names) + sum(sys.getsizeof(name) for name in self.new_names)
+        size += sum(sys.getsizeof(column) for column in (self.heads, self.tails, self.middles))
+        size += sys.getsizeof(self.tokens) + sum(sys.getsizeof(token) for token in self.tokens)
+        return size
+
+    def old_names(self):
+        """
+        Rebuilds the names from before the rename
+        :return: The old names, in order
+        :rtype: list[str]
+        """
+        tokens = self.tokens
+        return [new_name[:head] + tokens[middle] + new_name[len(new_name) - tail:]
+                for new_name, head, tail, middle in zip(self.new_names, self.heads, self.tails, self.middles)]
+
+
+class RenameHistory(object):
+    """
+    Undo and redo stacks of RenameBatches, evicting the oldest batches once they use more than the memory budget
+    """
+
+    def __init__(self, memory_budget=32 * 1024 * 1024, max_batches=None):
+        """
+        :param memory_budget: The most bytes the undo and redo stacks may hold together. The latest batch is always
+                              kept
+        :type memory_budget: int
+        :param max_batches: The most batches to keep undoable, or None for no limit
+        :type max_batches: int | None
+        """
+        self.memory_budget = memory_budget
+        self.max_batches = max_batches
+
+        self.undo_stack = []  # type: list[RenameBatch]
+        self.redo_stack = []  # type: list[RenameBatch]
+
+    def memory_usage(self):
+        """Returns the estimated bytes held by every stored batch"""
+        return sum(batch.memory for batch in self.undo_stack) + sum(batch.memory for batch in self.redo_stack)
+
+    def can_undo(self):
+        return len(self.undo_stack) > 0
+
+    def can_redo(self):
+        return len(self.redo_stack) > 0
+
+    def clear(self):
+        self.undo_stack = []
+        self.redo_stack = []
+
+    def record(self, old_names, new_names):
+        """
+        Stores a rename that has just been sent to the DCC. Anything that could be redone is dropped
+        :param old_names: The names before the rename
+        :type old_names: list[str]
+        :param new_names: The names after the rename, in the same order
+        :type new_names: list[str]
+        :return: Nothing
+        :rtype: None
+        """
+        self.redo_stack = []
+        self.undo_stack.append(RenameBatch(old_names, new_names))
+        self.evict()
+
+    def evict(self):
+        """
+        Drops the oldest batches until the history fits its memory budget and batch limit
+        :return: Nothing
+        :rtype: None
+        """
+        while len(self.undo_stack) > 1 and self.memory_usage() > self.memory_budget:
+            self.undo_stack.pop(0)
+        if self.max_batches is not None:
+            del self.undo_stack[:max(0, len(self.undo_stack) - self.max_batches)]
+
+    def undo(self):
+        """
+        Steps back one batch
+        :return: (names the objects have now, names to give them back), or None if there is nothing to undo
+        :rtype: tuple[list[str], list[str]] | None
+        """
+        if not self.undo_stack:
+            return None
+        batch = self.undo_stack.pop()
+        self.redo_stack.append(batch)
+        return list(batch.new_names), batch.old_names()
+
+    def redo(self):
+        """
+        Steps forward one batch
+        :return: (names the objects have now, names to rename them to), or None if there is nothing to redo
+        :rtype: tuple[list[str], list[str]] | None
+        """
+        if not self.redo_stack:
+            return None
+        batch = self.redo_stack.pop()
+        self.undo_stack.append(batch)
+        return batch.old_names(), list(batch.new_names)
@@ -0,0 +1,361 @@
+"""
+The rename engine behind the ObjectRenamer dialog. Nothing in here touches Qt, so headless batch scripts can rename
+names without ever constructing a QWidget:
+
+    plan = RenamePlan(prefix='L', side='l', separator='_', numeration=True, start_number=1)
+    new_names = plan.apply(['arm', 'leg', 'hand'])
+
+Current names can also be edited with a search and replace, matching plain text, glob wildcards or regular
+expressions. Wildcards must match the whole name and capture what each * and ? matched, so both wildcard and regex
+replacements can refer back to them with \\1, \\2, etc.
+"""
+
+import math
+import re
+from collections import Counter
+from functools import lru_cache
+
+
+SEARCH_MODES = ['text', 'wildcard', 'regex']
+
+
+def wildcard_to_regex(pattern):
+    """
+    Translates a glob wildcard into a regular expression matching the whole name. Every * and ? becomes a capture group
+    :param pattern: The wildcard, e.g. 'arm_*_jnt'
+    :type pattern: str
+    :return: The equivalent regular expression
+    :rtype: str
+    """
+    tokens = []
+    for char in pattern:
+        if char == '*':
+            tokens.append('(.*)')
+        elif char == '?':
+            tokens.append('(.)')
+        else:
+            tokens.append(re.escape(char))
+    return r'\A{}\Z'.format(''.join(tokens))
+
+
+@lru_cache(maxsize=64)
+def compile_search(search, search_mode='text'):
+    """
+    Compiles a search pattern. Results are cached, so typing into the search field only compiles each pattern once
+    :param search: The text, wildcard or regular expression to search for
+    :type search: str
+    :param search_mode: One of SEARCH_MODES
+    :type search_mode: str
+    :return: The compiled pattern
+    :rtype: re.Pattern
+    """
+    if search_mode == 'text':
+        return re.compile(re.escape(search))
+    elif search_mode == 'wildcard':
+        return re.compile(wildcard_to_regex(search))
+    elif search_mode == 'regex':
+        return re.compile(search)
+    raise ValueError('search_mode must be one of {}. Got: {}'.format(SEARCH_MODES, search_mode))
+
+
+@lru_cache(maxsize=64)
+def compile_replacement(pattern, replace):
+    """
+    Turns a replacement template into something re.sub can apply without re-parsing the template for every name.
+    Group references (\\1, \\g<1>, \\g<name>) are baked into a single format call
+    :param pattern: The compiled search pattern
+    :type pattern: re.Pattern
+    :param replace: The replacement template
+    :type replace: str
+    :return: The replacement as re.sub takes it. Templates using other escapes are returned unchanged
+    :rtype: str | callable
+    """
+    if '\\' not in replace:
+        return replace
+
+    pieces = []
+    position = 0
+    for match in re.finditer(r'\\(?:g<([^>]*)>|([0-9]+)|(.))', replace, re.DOTALL):
+        pieces.append(replace[position:match.start()].replace('{', '{{').replace('}', '}}'))
+        position = match.end()
+
+        name, number, escaped = match.groups()
+        if escaped == '\\':
+            pieces.append('\\')
+            continue
+        elif escaped is not None or (number is not None and (len(number) > 2 or number[0] == '0')):
+            # Other escapes and octal codes are left to re's own template parser
+            return replace
+
+        reference = number if number is not None else name
+        group = int(reference) if reference.isdigit() else pattern.groupindex.get(reference)
+        if group is None or group > pattern.groups:
+            return replace
+        pieces.append('{{{}}}'.format(group))
+    pieces.append(replace[position:].replace('{', '{{').replace('}', '}}'))
+
+    expand = ''.join(pieces).format
+    return lambda match: expand(match.group(0), *match.groups(''))
+
+
+class RenamePlan(object):
+    """
+    An immutable set of rename settings that turns a list of names into new names in a single pass
+    """
+
+    __slots__ = ('prefix', 'base_name', 'side', 'suffix', 'separator', 'numeration', 'numeration_digits',
+                 'start_number', 'remove_first', 'remove_last', 'search', 'replace', 'search_mode')
+
+    def __init__(self, prefix='', base_name='', side='', suffix='', separator='', numeration=False,
+                 numeration_digits=0, start_number=0, remove_first=0, remove_last=0, search='', replace='',
+                 search_mode='text'):
+        """
+        :param prefix: Text placed before the base name, followed by the separator
+        :type prefix: str
+        :param base_name: Replaces the current name when not empty
+        :type base_name: str
+        :param side: Text placed after the base name, preceded by the separator
+        :type side: str
+        :param suffix: Text placed after the side, preceded by the separator
+        :type suffix: str
+        :param separator: The string placed between each token of the name
+        :type separator: str
+        :param numeration: Should a number be appended to every name?
+        :type numeration: bool
+        :param numeration_digits: The minimum number of digits to pad the number to
+        :type numeration_digits: int
+        :param start_number: The number given to the first name
+        :type start_number: int
+        :param remove_first: How many characters to trim from the start of the final name
+        :type remove_first: int
+        :param remove_last: How many characters to trim from the end of the final name
+        :type remove_last: int
+        :param search: Searched for in every current name. Nothing is replaced when empty
+        :type search: str
+        :param replace: Replaces every match of the search
+        :type replace: str
+        :param search_mode: How the search is matched, one of SEARCH_MODES
+        :type search_mode: str
+        """
+        self.prefix = prefix
+        self.base_name = base_name
+        self.side = side
+        self.suffix = suffix
+        self.separator = separator
+        self.numeration = numeration
+        self.numeration_digits = numeration_digits
+        self.start_number = start_number
+        self.remove_first = remove_first
+        self.remove_last = remove_last
+        self.search = search
+        self.replace = replace
+        self.search_mode = search_mode
+
+    def validate(self):
+        """
+        Checks the search and replace can be applied
+        :return: Nothing
+        :rtype: None
+        :raises re.error: The search is not a valid pattern, or the replace is not a valid template
+        :raises IndexError: The replace refers to a named group that does not exist
+        """
+        if self.search != '' and self.search_mode != 'text':
+            compile_search(self.search, self.search_mode).sub(self.replace, '')
+
+    def search_and_replace(self, names):
+        """
+        Applies the search and replace to every name
+        :param names: The current names
+        :type names: list[str]
+        :return: The edited names, in the same order
+        :rtype: list[str]
+        """
+        if self.search == '':
+            return names
+        if self.search_mode == 'text':
+            search, replace = self.search, self.replace
+            return [name.replace(search, replace) for name in names]
+
+        pattern = compile_search(self.search, self.search_mode)
+        sub, replace = pattern.sub, compile_replacement(pattern, self.replace)
+        return [sub(replace, name) for name in names]
+
+    def digits_for(self, count):
+        """
+        Gets the number of digits the numeration is padded to for a list of the given length
+        :param count: The total number of names being renamed
+        :type count: int
+        :return: The padding width
+        :rtype: int
+        """
+        row_digits = int(math.log10(count)) + 1 if count > 0 else 0
+        return self.numeration_digits if self.numeration_digits > row_digits else row_digits
+
+    def _template(self, count):
+        """
+        Builds a single format string holding every constant token, so each name costs one format call
+        :param count: The total number of names being renamed
+        :type count: int
+        :return: The format string, taking the base name and the number
+        :rtype: str
+        """
+        def escape(text):
+            return text.replace('{', '{{').replace('}', '}}')
+
+        separator = escape(self.separator)
+        template = '{}{}'.format(escape(self.prefix), separator) if self.prefix != '' else ''
+        template += '{0}'
+        template += '{}{}'.format(separator, escape(self.side)) if self.side != '' else ''
+        template += '{}{}'.format(separator, escape(self.suffix)) if self.suffix != '' else ''
+
+        if self.numeration:
+            digits = self.digits_for(count)
+            template += '{}{{1:0{}d}}'.format(separator, digits) if digits > 0 else '{1:d}'
+        return template
+
+    def rename(self, name, index, count):
+        """
+        Computes the new name for a single entry
+        :param name: The current name
+        :type name: str
+        :param index: The position of the name in the full list
+        :type index: int
+        :param count: The total number of names being renamed
+        :type count: int
+        :return: The new name
+        :rtype: str
+        """
+        return self.apply([name], start=index, count=count)[0]
+
+    def apply(self, names, start=0, count=None):
+        """
+        Renames every name in one pass
+        :param names: The current names
+        :type names: list[str]
+        :param start: The position of the first name in the full list, used for numeration
+        :type start: int
+        :param count: The length of the full list, used for the numeration padding. Defaults to len(names)
+        :type count: int | None
+        :return: The new names, in the same order
+        :rtype: list[str]
+        """
+        count = len(names) if count is None else count
+        build = self._template(count).format
+
+        numbers = range(self.start_number + start, self.start_number + start + len(names))
+
+        if self.base_name == '' and self.search != '':
+            names = self.search_and_replace(names)
+
+        if self.base_name != '':
+            if self.numeration:
+                new_names = [build(self.base_name, number) for number in numbers]
+            else:
+                new_names = [build(self.base_name, 0)] * len(names)
+        elif self.numeration:
+            new_names = list(map(build, names, numbers))
+        else:
+            new_names = [build(name, 0) for name in names]
+
+        if self.remove_first or self.remove_last:
+            first, last = self.remove_first, self.remove_last
+            new_names = [name[first:len(name) - last] for name in new_names]
+
+        return new_names
+
+
+class RenameCollisionIndex(object):
+    """
+    A hash index over previewed names that answers "does this new name collide?" in O(1). A name collides if more than
+    one row is being given it, or if it is already taken in the scene by an object that is not part of the rename
+    """
+
+    def __init__(self, existing_names=None):
+        """
+        :param existing_names: Every name currently in the scene, if the caller knows them
+        :type existing_names: list[str] | set[str] | None
+        """
+        self.counts = Counter()
+        self.existing_names = set(existing_names or ())
+        self.released_names = set()
+
+    def set_existing_names(self, existing_names):
+        """
+        Replaces the set of names already taken in the scene
+        :param existing_names: Every name currently in the scene
+        :type existing_names: list[str] | set[str]
+        :return: Nothing
+        :rtype: None
+        """
+        self.existing_names = set(existing_names)
+
+    def reset(self, current_names=()):
+        """
+        Forgets every previewed name
+        :param current_names: The names of the objects being renamed. They give their names up, so they are free to
+                              reuse
+        :type current_names: list[str]
+        :return: Nothing
+        :rtype: None
+        """
+        self.counts = Counter()
+        self.released_names = set(current_names) if self.existing_names else set()
+
+    def add(self, names):
+        """
+        Adds a block of previewed names to the index
+        :param names: The new names
+        :type names: list[str]
+        :return: Nothing
+        :rtype: None
+        """
+        self.counts.update(names)
+
+    def is_colliding(self, name):
+        """
+        Checks a single previewed name
+        :param name: The new name to check
+        :type name: str
+        :return: True if the name is not unique
+        :rtype: bool
+        """
+        if self.counts[name] > 1:
+            return True
+        return name in self.existing_names and name not in self.released_names
+
+    def collisions(self):
+        """
+        Gets every previewed name that is not unique
+        :return: The colliding names, sorted
+        :rtype: list[str]
+        """
+        return sorted(name for name, count in self.counts.items() if count > 1 or
+                      (name in self.existing_names and name not in self.released_names))
+
+    def resolve(self, names, separator=''):
+        """
+        Makes every name unique by numbering the repeats. The first row to use a free name keeps it
+        :param names: The new names, as previewed
+        :type names: list[str]
+        :param separator: Placed between the name and the number added to it
+        :type separator: str
+        :return: The unique names, in the same order
+        :rtype: list[str]
+        """
+        taken = self.existing_names - self.released_names
+        resolved = list(names)
+        for row, name in enumerate(names):
+            if not self.is_colliding(name):
+                taken.add(name)
+                continue
+            if name not in taken:
+                taken.add(name)
+                continue
+            number = 1
+            candidate = '{}{}{}'.format(name, separator, number)
+            while candidate in taken or candidate in self.counts:
+                number += 1
+                candidate = '{}{}{}'.format(name, separator, number)
+            taken.add(candidate)
+            resolved[row] = candidate
+        return resolved
@@ -0,0 +1,248 @@
+"""
+Reads and writes the selection set payload the DCC keeps in the scene, without touching Qt. The payload is the json
+dict described in ObjectExporter, keyed by set name:
+
+    {"arm_set": {"path": "c:/path/to/export", "triangulate": 1, "sceneup": 0, ...}, ...}
+
+A list of set dicts, each holding its own "name", is read as well, since that is what ObjectExporter.scene_data_changed
+takes. Either way every set comes out as a flat dict holding its name and every setting, with missing settings set to 0:
+
+    scene_dicts = decode(root_node_json)
+    root_node_json = encode(scene_dicts)
+
+iter_decode reads the same payload from a file one set at a time, for scenes with too many sets to parse in one go.
+"""
+
+import json
+
+
+# The settings every set carries next to its name, and the types they are stored as
+SETTING_TYPES = {'path': str,
+                 'origin': int,
+                 'smoothing_groups': int,
+                 'triangulate': int,
+                 'turbosmooth': int,
+                 'tanbi': int,
+                 'svn': int,
+                 'skinning': int,
+                 'sceneup': int}
+
+INT_SETTINGS = [key for key, setting_type in SETTING_TYPES.items() if setting_type is int]
+
+_WHITESPACE = ' \t\n\r'
+
+
+class SceneDataError(ValueError):
+    """
+    The payload does not match the documented schema
+    """
+
+
+def validate(scene_data, set_name=None):
+    """
+    Checks a single set against the schema
+    :param scene_data: The set's settings
+    :type scene_data: dict
+    :param set_name: The name of the set, if it is not in scene_data itself
+    :type set_name: str | None
+    :return: Nothing
+    :rtype: None
+    :raises SceneDataError: The set is not a dict, has no name or holds a setting of the wrong type
+    """
+    normalise(scene_data, set_name)
+
+
+def normalise(scene_data, set_name=None):
+    """
+    Validates a set and builds its flat dict, the form every function in here returns, in a single pass
+    :param scene_data: The set's settings
+    :type scene_data: dict
+    :param set_name: The name of the set, if it is not in scene_data itself
+    :type set_name: str | None
+    :return: The set's name and every setting
+    :rtype: dict
+    :raises SceneDataError: The set does not match the schema
+    """
+    if not isinstance(scene_data, dict):
+        raise SceneDataError('Set {!r} should be a dict. Got: {}'.format(set_name, type(scene_data).__name__))
+    get = scene_data.get
+
+    name = get('name', None) if set_name is None else set_name
+    if not isinstance(name, str) or name == '':
+        raise SceneDataError('Every set needs a name. Got: {!r}'.format(name))
+    path = get('path', None)
+    if path is not None and not isinstance(path, str):
+        raise SceneDataError('The path of set {!r} should be a string. Got: {!r}'.format(name, path))
+
+    normalised = {'name': name, 'path': path}
+    for key in INT_SETTINGS:
+        value = get(key, 0)
+        if value.__class__ is not int:
+            if value is None:
+                value = 0
+            elif isinstance(value, int):
+                value = int(value)
+            else:
+                raise SceneDataError('{} of set {!r} should be an int. Got: {!r}'.format(key, name, value))
+        normalised[key] = value
+    return normalised
+
+
+def decode_payload(payload):
+    """
+    Normalises an already parsed payload
+    :param payload: The payload, a dict of sets keyed by name or a list of sets
+    :type payload: dict | list
+    :return: A flat dict per set, in payload order. Only the first set of each name is kept
+    :rtype: list[dict]
+    :raises SceneDataError: The payload does not match the schema
+    """
+    if isinstance(payload, dict):
+        scene_dicts = [normalise(scene_data, set_name) for set_name, scene_data in payload.items()]
+    elif isinstance(payload, list):
+        scene_dicts = [normalise(scene_data) for scene_data in payload]
+    else:
+        raise SceneDataError('The payload should be a dict or a list. Got: {}'.format(type(payload).__name__))
+
+    names = set()
+    unique_dicts = []
+    for scene_data in scene_dicts:
+        if scene_data['name'] not in names:
+            names.add(scene_data['name'])
+            unique_dicts.append(scene_data)
+    return unique_dicts
+
+
+def decode(text):
+    """
+    Parses a payload
+    :param text: The json held in the scene. An empty string is read as no sets
+    :type text: str | bytes
+    :return: A flat dict per set, in payload order
+    :rtype: list[dict]
+    :raises SceneDataError: The text is not json or does not match the schema
+    """
+    if not text or not text.strip():
+        return []
+    try:
+        payload = json.loads(text)
+    except ValueError as error:
+        raise SceneDataError('The payload is not valid json: {}'.format(error))
+    return decode_payload(payload)
+
+
+def encode(scene_dicts, as_list=False, check=True):
+    """
+    Builds the payload to store in the scene
+    :param scene_dicts: A dict per set, holding its name
+    :type scene_dicts: list[dict]
+    :param as_list: Write a list of sets instead of the dict keyed by set name
+    :type as_list: bool
+    :param check: Validate every set first. Sets that are already flat dicts of the right types can skip this
+    :type check: bool
+    :return: The json text
+    :rtype: str
+    :raises SceneDataError: A set does not match the schema
+    """
+    if check:
+        scene_dicts = [normalise(scene_data) for scene_data in scene_dicts]
+    if as_list:
+        return json.dumps(scene_dicts, separators=(',', ':'))
+
+    payload = dict()
+    for scene_data in scene_dicts:
+        settings = dict(scene_data)
+        payload[settings.pop('name')] = settings
+    return json.dumps(payload, separators=(',', ':'))
+
+
+def iter_decode(stream, chunk_size=1 << 16):
+    """
+    Parses a payload from a file one set at a time, never holding more than one set and a chunk of text
+    :param stream: A text file holding the payload
+    :type stream: io.TextIOBase
+    :param chunk_size: How many characters to read at once
+    :type chunk_size: int
+    :return: A flat dict per set, in payload order. Sets repeating an earlier name are skipped
+    :rtype: collections.Iterator[dict]
+    :raises SceneDataError: The text is not json or does not match the schema
+    """
+    decoder = json.JSONDecoder()
+    buffer = ''
+    position = 0
+    at_end = False
+
+    def fill():
+        """Reads another chunk, dropping what has been parsed. Returns False at the end of the file"""
+        nonlocal buffer, position, at_end
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            at_end = True
+            return False
+        buffer = buffer[position:] + chunk
+        position = 0
+        return True
+
+    def next_char():
+        """Skips whitespace and returns the next character, or '' at the end of the file"""
+        nonlocal position
+        while True:
+            while position < len(buffer) and buffer[position] in _WHITESPACE:
+                position += 1
+            if position < len(buffer):
+                return buffer[position]
+            if not fill():
+                return ''
+
+    def next_value():
+        """Parses the json value starting at the next non-whitespace character"""
+        nonlocal position
+        next_char()
+        while True:
+            try:
+                value, position = decoder.raw_decode(buffer, position)
+                return value
+            except ValueError as error:
+                if at_end or not fill():
+                    raise SceneDataError('The payload is not valid json: {}'.format(error))
+
+    def expect(chars):
+        nonlocal position
+        char = next_char()
+        if char == '' or char not in chars:
+            raise SceneDataError('The payload is not valid json: expected one of {!r} at {!r}'.format(chars, char))
+        position += 1
+        return char
+
+    def expect_end():
+        """Checks nothing but whitespace follows the payload, as json.loads does"""
+        char = next_char()
+        if char != '':
+            raise SceneDataError('The payload is not valid json: extra data after the payload at {!r}'.format(char))
+
+    opening = next_char()
+    if opening == '':
+        return
+    is_dict = expect('{[') == '{'
+    closing = '}' if is_dict else ']'
+
+    names = set()
+    if next_char() == closing:
+        position += 1
+        expect_end()
+        return
+    while True:
+        if is_dict:
+            set_name = next_value()
+            expect(':')
+            scene_data = normalise(next_value(), set_name)
+        else:
+            scene_data = normalise(next_value())
+
+        if scene_data['name'] not in names:
+            names.add(scene_data['name'])
+            yield scene_data
+
+        if expect(',' + closing) == closing:
+            expect_end()
+            return
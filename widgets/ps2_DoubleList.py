@@ -1,8 +1,241 @@
 """
 Creates two list view vertically or horizontally. The view in the second listbox will change based on the selection
 in the first listbox. Will take in a dictionary.
+
+The dictionary is never copied into items: the first list reads its keys and the second list reads the selected key's
+values straight from the dictionary, fetching them in batches as the view scrolls. The detail models of the last few
+keys viewed are kept, so switching back to them does not start over.
 """
+from collections import OrderedDict
+from collections.abc import Sequence
 from PySide2 import QtWidgets, QtGui, QtCore
-from PySide2.QtCore import Signal, Slot, Qt
+from PySide2.QtCore import Signal, Slot, Qt, QModelIndex, QAbstractListModel
+
+
+class DoubleListKeyModel(QAbstractListModel):
+    def __init__(self, data=None, parent=None):
+        """
+        Lists the keys of a dictionary
+        :param data: The dictionary whose keys are listed
+        :type data: dict
+        """
+        super(DoubleListKeyModel, self).__init__(parent)
+
+        self.keys = []
+        self.set_data(data or {})
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self.keys)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        if role == Qt.DisplayRole:
+            return str(self.keys[index.row()])
+        if role == Qt.UserRole:
+            return self.keys[index.row()]
+        return None
+
+    def set_data(self, data):
+        self.beginResetModel()
+        self.keys = list(data.keys())
+        self.endResetModel()
+
+
+class DoubleListDetailModel(QAbstractListModel):
+    def __init__(self, values, batch_size=1000, parent=None):
+        """
+        Lists the values of a single key, handing them to the view a batch at a time as it asks for more
+        :param values: The values to list. Sequences are read in place; anything else is copied into a list once
+        :type values: list
+        :param batch_size: How many values are added each time the view scrolls to the end of what is loaded
+        :type batch_size: int
+        """
+        super(DoubleListDetailModel, self).__init__(parent)
+
+        self.values = values if isinstance(values, Sequence) and not isinstance(values, str) else list(values)
+        self.batch_size = max(1, batch_size)
+        self.loaded = min(len(self.values), self.batch_size)
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return self.loaded
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        if role == Qt.DisplayRole:
+            return str(self.values[index.row()])
+        if role == Qt.UserRole:
+            return self.values[index.row()]
+        return None
+
+    def canFetchMore(self, parent=QModelIndex()):
+        if parent.isValid():
+            return False
+        return self.loaded < len(self.values)
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid():
+            return
+        count = min(self.batch_size, len(self.values) - self.loaded)
+        if count <= 0:
+            return
+        self.beginInsertRows(QModelIndex(), self.loaded, self.loaded + count - 1)
+        self.loaded += count
+        self.endInsertRows()
+
+
+class DoubleList(QtWidgets.QWidget):
+    """
+    Two list views over a dictionary: the keys, and the values of the selected key
+    """
+
+    key_changed = Signal(object)  # emitted with the newly selected key, or None
+
+    def __init__(self, data=None, orientation=Qt.Horizontal, batch_size=1000, cache_size=8, *args, **kwargs):
+        """
+        :param data: The dictionary of keys to lists of values to show
+        :type data: dict
+        :param orientation: Place the lists side by side with Qt.Horizontal, or one above the other with Qt.Vertical
+        :type orientation: Qt.Orientation
+        :param batch_size: How many values the second list loads at a time
+        :type batch_size: int
+        :param cache_size: How many keys keep their loaded values once another key is selected
+        :type cache_size: int
+        """
+        super(DoubleList, self).__init__(*args, **kwargs)
 
+        self.data = data if data is not None else {}
+        self.batch_size = batch_size
+        self.cache_size = max(1, cache_size)
+        self.detail_models = OrderedDict()  # type: OrderedDict[object, DoubleListDetailModel]
+        self.empty_model = DoubleListDetailModel([], parent=self)
 
+        if orientation == Qt.Horizontal:
+            main_layout = QtWidgets.QHBoxLayout()
+        else:
+            main_layout = QtWidgets.QVBoxLayout()
+
+        self.key_model = DoubleListKeyModel(self.data, parent=self)
+        self.key_list = QtWidgets.QListView()
+        self.key_list.setUniformItemSizes(True)
+        self.key_list.setModel(self.key_model)
+        self.key_list.selectionModel().currentRowChanged.connect(self.key_row_changed)
+
+        self.detail_list = QtWidgets.QListView()
+        self.detail_list.setUniformItemSizes(True)
+        self.detail_list.setSelectionMode(QtWidgets.QAbstractItemView.ExtendedSelection)
+        self.detail_list.setModel(self.empty_model)
+
+        main_layout.addWidget(self.key_list)
+        main_layout.addWidget(self.detail_list)
+        self.setLayout(main_layout)
+
+    def set_data(self, data):
+        """
+        Shows a new dictionary, dropping every cached detail model
+        :param data: The dictionary of keys to lists of values to show
+        :type data: dict
+        :return: Nothing
+        :rtype: None
+        """
+        self.data = data
+        self.set_detail_model(self.empty_model)
+        for detail_model in self.detail_models.values():
+            detail_model.deleteLater()
+        self.detail_models = OrderedDict()
+        self.key_model.set_data(data)
+
+    def refresh_key(self, key):
+        """
+        Drops the cached values of a key after its list changed in the dictionary, reloading it if it is shown
+        :param key: The key whose values changed
+        :type key: object
+        :return: Nothing
+        :rtype: None
+        """
+        detail_model = self.detail_models.pop(key, None)
+        if detail_model is None:
+            return
+        if self.detail_list.model() is detail_model:
+            self.show_key(key)
+        detail_model.deleteLater()
+
+    def current_key(self):
+        """
+        :return: The selected key, or None
+        :rtype: object
+        """
+        return self.key_list.currentIndex().data(Qt.UserRole) if self.key_list.currentIndex().isValid() else None
+
+    def selected_values(self):
+        """
+        :return: The values selected in the second list
+        :rtype: list
+        """
+        return [index.data(Qt.UserRole) for index in self.detail_list.selectionModel().selectedIndexes()]
+
+    def detail_model(self, key):
+        """
+        Gets the detail model of a key, creating it if it is not cached, and evicts the least recently viewed
+        :param key: A key of the dictionary
+        :type key: object
+        :return: The model listing the key's values
+        :rtype: DoubleListDetailModel
+        """
+        detail_model = self.detail_models.get(key, None)
+        if detail_model is None:
+            detail_model = DoubleListDetailModel(self.data[key], batch_size=self.batch_size, parent=self)
+            self.detail_models[key] = detail_model
+        self.detail_models.move_to_end(key)
+
+        while len(self.detail_models) > self.cache_size:
+            evicted_key, evicted_model = self.detail_models.popitem(last=False)
+            evicted_model.deleteLater()
+        return detail_model
+
+    def show_key(self, key):
+        """
+        Shows the values of a key in the second list
+        :param key: A key of the dictionary, or None to clear the second list
+        :type key: object
+        :return: Nothing
+        :rtype: None
+        """
+        if key is None or key not in self.data:
+            self.set_detail_model(self.empty_model)
+        else:
+            self.set_detail_model(self.detail_model(key))
+
+    def set_detail_model(self, detail_model):
+        """
+        Shows a model in the second list. The view makes a new selection model for every model it is given and keeps the
+        old one as a child, so the old one is deleted here
+        :param detail_model: The model to show
+        :type detail_model: DoubleListDetailModel
+        :return: Nothing
+        :rtype: None
+        """
+        if self.detail_list.model() is detail_model:
+            return
+        old_selection_model = self.detail_list.selectionModel()
+        self.detail_list.setModel(detail_model)
+        if old_selection_model is not None:
+            old_selection_model.deleteLater()
+
+    def key_row_changed(self, current, previous):
+        key = current.data(Qt.UserRole) if current.isValid() else None
+        self.show_key(key)
+        self.key_changed.emit(key)
+
+
+"""
+Demonstrations:
+
+        self.double_list = ps2_DoubleList.DoubleList({'Fruit': ['Apple', 'Pear'], 'Vegetables': ['Leek', 'Kale']})
+        self.double_list.key_changed.connect(print)
+"""
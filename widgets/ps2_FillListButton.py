@@ -1,5 +1,5 @@
 from PySide2 import QtWidgets, QtGui
-from PySide2.QtCore import Signal, QStringListModel
+from PySide2.QtCore import Signal, Qt, QStringListModel
 
 
 class FillListButton(QtWidgets.QWidget):
@@ -10,9 +10,20 @@ class FillListButton(QtWidgets.QWidget):
     clicked = Signal()
 
     def __init__(self, *args, **kwargs):
+        """
+        :param unique: Skip values already in the list, and put back edits that would duplicate another row
+        :type unique: bool
+        :param max_entries: The most values the list will hold, or None for no limit
+        :type max_entries: int | None
+        """
+        self.unique = kwargs.pop('unique', False)
+        self.max_entries = kwargs.pop('max_entries', None)
 
         super(FillListButton, self).__init__(*args, **kwargs)
 
+        self.list_values = set()  # type: set[str]  # Only kept when unique. Blank rows are not values
+        self.list_rows = []  # type: list[str]  # The value of every row before its last edit, only kept when unique
+
         self.layout = QtWidgets.QHBoxLayout()
         self.list_model = QStringListModel()
         self.list = QtWidgets.QListView()
@@ -24,6 +35,13 @@ class FillListButton(QtWidgets.QWidget):
 
     def generate_ui(self):
         self.fill_button.clicked.connect(self.on_clicked)
+        # Edits in the view and changes made straight to the model are checked against unique and max_entries here
+        self.list_model.dataChanged.connect(self.on_data_changed)
+        self.list_model.rowsInserted.connect(self.on_rows_inserted)
+        self.list_model.rowsRemoved.connect(self.on_rows_removed)
+        self.list_model.rowsMoved.connect(self.sync_list_values)
+        self.list_model.layoutChanged.connect(self.sync_list_values)
+        self.list_model.modelReset.connect(self.sync_list_values)
 
         self.layout.addWidget(self.list)
         self.layout.addWidget(self.fill_button)
@@ -35,12 +53,83 @@ class FillListButton(QtWidgets.QWidget):
 
     @list_text.setter
     def list_text(self, value: list[str]):
+        if self.unique:
+            value = list(dict.fromkeys(value))
+        if self.max_entries is not None:
+            value = value[:self.max_entries]
         self.list_model.setStringList(value)
 
     def add_value_to_list(self, value: str):
-        str_list = self.list_text
-        str_list.append(value)
-        self.list_text = str_list
+        self.add_values([value])
+
+    def add_values(self, values: list[str]):
+        """
+        Appends values to the end of the list as a single insert, keeping the view's selection and scroll position
+        :param values: The values to add, in order
+        :type values: list[str]
+        :return: How many values were added, after skipping duplicates and values past max_entries
+        :rtype: int
+        """
+        if self.unique:
+            values = [value for value in dict.fromkeys(values) if value not in self.list_values]
+
+        row = self.list_model.rowCount()
+        if self.max_entries is not None:
+            values = values[:max(0, self.max_entries - row)]
+        if not values:
+            return 0
+
+        self.list_model.insertRows(row, len(values))
+        # The new rows are filled silently and announced with a single dataChanged
+        self.list_model.blockSignals(True)
+        try:
+            for offset, value in enumerate(values):
+                self.list_model.setData(self.list_model.index(row + offset), value, Qt.EditRole)
+        finally:
+            self.list_model.blockSignals(False)
+        self.list_model.dataChanged.emit(self.list_model.index(row), self.list_model.index(row + len(values) - 1),
+                                         [Qt.DisplayRole, Qt.EditRole])
+        return len(values)
+
+    def sync_list_values(self):
+        """Reads list_values and list_rows from the model again after its rows were replaced or reordered"""
+        if self.unique:
+            self.list_rows = self.list_model.stringList()
+            self.list_values = set(self.list_rows)
+            self.list_values.discard('')
+
+    def on_data_changed(self, top_left, bottom_right, roles=()):
+        """Takes edited values into list_values, putting back any edit that would duplicate another row"""
+        if not self.unique:
+            return
+        for row in range(top_left.row(), bottom_right.row() + 1):
+            previous = self.list_rows[row]
+            value = self.list_model.index(row).data(Qt.EditRole)
+            if value == previous:
+                continue
+            if value and value in self.list_values:
+                # Putting the previous value back emits dataChanged again, which finds nothing to do
+                self.list_model.setData(self.list_model.index(row), previous, Qt.EditRole)
+                continue
+            self.list_values.discard(previous)
+            if value:
+                self.list_values.add(value)
+            self.list_rows[row] = value
+
+    def on_rows_inserted(self, parent, first, last):
+        """Takes inserted rows into list_values and removes any inserted past max_entries"""
+        if self.unique:
+            self.list_rows[first:first] = [self.list_model.index(row).data(Qt.EditRole)
+                                           for row in range(first, last + 1)]
+            self.list_values.update(value for value in self.list_rows[first:last + 1] if value)
+        if self.max_entries is not None and self.list_model.rowCount() > self.max_entries:
+            excess = min(self.list_model.rowCount() - self.max_entries, last - first + 1)
+            self.list_model.removeRows(last - excess + 1, excess)
+
+    def on_rows_removed(self, parent, first, last):
+        if self.unique:
+            self.list_values.difference_update(self.list_rows[first:last + 1])
+            del self.list_rows[first:last + 1]
 
     def on_clicked(self):
         self.clicked.emit()
@@ -1,5 +1,105 @@
 from PySide2 import QtWidgets, QtGui, QtCore
-from PySide2.QtCore import Signal, Slot, Qt
+from PySide2.QtCore import Signal, Slot, Qt, QModelIndex, QAbstractListModel
+
+
+class RenameListModel(QAbstractListModel):
+    def __init__(self, entries=None, expandable=False, parent=None):
+        """
+        A list model of plain strings. When expandable, the list always ends in a single blank entry: naming it adds a
+        new blank after it and blanking any other entry removes that entry, so no edit ever has to scan the list
+        :param entries: The strings to begin the list with
+        :type entries: list[str]
+        :param expandable: Is this list expandable when a new entry is added?
+        :type expandable: bool
+        """
+        super(RenameListModel, self).__init__(parent)
+
+        self.expandable = expandable
+        self.entries = []  # type: list[str]
+        self.set_items(entries or [])
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self.entries)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        if role in (Qt.DisplayRole, Qt.EditRole):
+            return self.entries[index.row()]
+        return None
+
+    def setData(self, index, value, role=Qt.EditRole):
+        """
+        Renames an entry. In an expandable list, naming the trailing blank appends a new blank and blanking any other
+        entry removes it. A fixed list ignores blank names
+        """
+        if not index.isValid() or role not in (Qt.DisplayRole, Qt.EditRole):
+            return False
+        row = index.row()
+        value = '' if value is None else value
+        if value == self.entries[row]:
+            return True
+
+        is_trailing_blank = self.expandable and row == len(self.entries) - 1
+        if value == '':
+            if not self.expandable or is_trailing_blank:
+                return False
+            self.beginRemoveRows(QModelIndex(), row, row)
+            del self.entries[row]
+            self.endRemoveRows()
+            return True
+
+        self.entries[row] = value
+        self.dataChanged.emit(index, index, [Qt.DisplayRole, Qt.EditRole])
+        if is_trailing_blank:
+            self.beginInsertRows(QModelIndex(), row + 1, row + 1)
+            self.entries.append('')
+            self.endInsertRows()
+        return True
+
+    @property
+    def items(self):
+        """
+        A snapshot of the entries, without the trailing blank of an expandable list
+        :return: The entries, in order
+        :rtype: list[str]
+        """
+        return self.entries[:-1] if self.expandable else list(self.entries)
+
+    def set_items(self, entries):
+        """
+        Replaces every entry in one model reset. Blank entries are dropped from an expandable list
+        :param entries: The new strings
+        :type entries: list[str]
+        :return: Nothing
+        :rtype: None
+        """
+        self.beginResetModel()
+        if self.expandable:
+            self.entries = [entry for entry in entries if entry]
+            self.entries.append('')
+        else:
+            self.entries = list(entries)
+        self.endResetModel()
+
+    def add_items(self, entries):
+        """
+        Appends entries in a single insert, ahead of the trailing blank of an expandable list
+        :param entries: The strings to add
+        :type entries: list[str]
+        :return: Nothing
+        :rtype: None
+        """
+        if self.expandable:
+            entries = [entry for entry in entries if entry]
+        if not entries:
+            return
+        row = len(self.entries) - 1 if self.expandable else len(self.entries)
+        self.beginInsertRows(QModelIndex(), row, row + len(entries) - 1)
+        self.entries[row:row] = entries
+        self.endInsertRows()
 
 
 class RenameList(QtWidgets.QWidget):
@@ -14,19 +114,16 @@ class RenameList(QtWidgets.QWidget):
         """
         super(RenameList, self).__init__(*args, **kwargs)
 
-        self.starting_list = starting_list if type(starting_list) == list else []
+        self.starting_list = list(starting_list) if type(starting_list) == list else []
         self.expandable = expandable
 
-        if expandable:
-            self.starting_list.append('')
-
         main_layout = QtWidgets.QVBoxLayout()
 
-        self.list_box = QtWidgets.QListWidget()
-        self.list_box.addItems(self.starting_list)
-        self.list_box.currentRowChanged.connect(self.list_index_changed)
-        if self.expandable:
-            self.list_box.itemChanged.connect(self.item_changed)
+        self.list_model = RenameListModel(self.starting_list, expandable=expandable, parent=self)
+        self.list_box = QtWidgets.QListView()
+        self.list_box.setUniformItemSizes(True)
+        self.list_box.setModel(self.list_model)
+        self.list_box.selectionModel().currentRowChanged.connect(self.current_row_changed)
         self.rename_view = QtWidgets.QLineEdit()
         self.rename_view.editingFinished.connect(self.rename_editing_finished)
 
@@ -37,31 +134,21 @@ class RenameList(QtWidgets.QWidget):
 
     @property
     def items(self):
-        return self.list_box.items()
+        return self.list_model.items
+
+    def current_row_changed(self, current, previous):
+        self.list_index_changed(current.row())
 
     def list_index_changed(self, new_index):
-        try:
-            self.rename_view.setText(self.list_box.item(new_index).data(Qt.DisplayRole))
-        except AttributeError:
-            pass
+        if 0 <= new_index < self.list_model.rowCount():
+            self.rename_view.setText(self.list_model.entries[new_index])
 
     def rename_editing_finished(self):
         if not self.expandable and self.rename_view.text() == '':
             return
-        try:
-            self.list_box.currentItem().setData(Qt.DisplayRole, self.rename_view.text())
-        except AttributeError:
-            pass
-
-    def item_changed(self, new_item):
-        items_to_remove = []
-        for ind, item in enumerate(range(self.list_box.count())):
-            if self.list_box.item(ind).data(Qt.DisplayRole) == '':
-                items_to_remove.append(ind)
-        for ind in reversed(items_to_remove):
-            self.list_box.takeItem(ind)
-
-        self.list_box.addItem('')
+        current_index = self.list_box.currentIndex()
+        if current_index.isValid():
+            self.list_model.setData(current_index, self.rename_view.text())
 
 
 """
@@ -1,6 +1,8 @@
 from PySide2 import QtWidgets, QtCore, QtGui
 from PySide2.QtCore import SIGNAL, Signal
 
+QWIDGETSIZE_MAX = (1 << 24) - 1
+
 
 def clear_layout(layout):
     """
@@ -24,6 +26,25 @@ def clear_layout(layout):
             raise TypeError('Requested layout must be based from QLayout. Got: {}'.format(type(layout)))
 
 
+def layout_widgets(layout):
+    """
+    Yields every widget held by a layout, including those of nested layouts
+
+    :param layout: The layout to walk
+    :type layout: QtWidgets.QLayout
+
+    :return: The widgets, in layout order
+    :rtype: collections.Iterator[QtWidgets.QWidget]
+    """
+    for index in range(layout.count()):
+        child = layout.itemAt(index)
+        if child.widget() is not None:
+            yield child.widget()
+        elif child.layout() is not None:
+            for widget in layout_widgets(child.layout()):
+                yield widget
+
+
 class Rollout(QtWidgets.QWidget):
     """A collapsible container to collapse/expand widget"""
     # _________________________________
@@ -42,8 +63,36 @@ class Rollout(QtWidgets.QWidget):
     collapsed = Signal()  # emitted after widget collapsed
 
     def __init__(self, label=None, border=False, content=None, *args, **kwargs):
+        """
+        :param label: The title, as text or a QWidget or QLayout
+        :type label: str | QtWidgets.QWidget | QtWidgets.QLayout
+        :param border: Draw a frame around the Rollout
+        :type border: bool
+        :param content: The ui to wrap, built up front
+        :type content: QtWidgets.QWidget | QtWidgets.QLayout
+        :param content_factory: Called with no arguments to build the content the first time the Rollout expands,
+                                returning a QWidget or QLayout. Ignored when content is given
+        :type content_factory: callable
+        :param collapsed: Start collapsed
+        :type collapsed: bool
+        :param prewarm: Build the content from the factory once the event loop is idle, even while collapsed
+        :type prewarm: bool
+        :param content_height: The height the content is expected to have, held by a placeholder while it is expanded
+                               but not built yet
+        :type content_height: int
+        """
+        self.content_factory = kwargs.pop('content_factory', None)
+        start_collapsed = kwargs.pop('collapsed', False)
+        prewarm = kwargs.pop('prewarm', False)
+        self.content_height = kwargs.pop('content_height', None)
+
         super(Rollout, self).__init__()
 
+        self._content_built = False
+        self._prewarm_timer = None
+        self._frozen_widgets = None  # The widgets freeze_content hid, until thaw_content shows them again
+        self._last_content_height = None  # The height the content had when it was last built or shown
+
         # structure
         main_layout = QtWidgets.QGridLayout()
 
@@ -108,6 +157,14 @@ class Rollout(QtWidgets.QWidget):
                                   '}')
         self.button.clicked.connect(self.toggle)
 
+        if start_collapsed:
+            self._content.setVisible(False)
+            self.button.setArrowType(QtCore.Qt.RightArrow)
+        else:
+            self.build_content()
+        if prewarm:
+            self.prewarm()
+
     @property
     def label(self):
         return [self._label.layout().itemAt(i) for i in range(self._label.layout().count())]
@@ -152,6 +209,138 @@ class Rollout(QtWidgets.QWidget):
                 self._content.layout().addLayout(value)
             else:
                 raise TypeError('content must inherit from type QWidget or QLayout')
+            self._content_built = True
+            # Qt shows widgets added to a visible parent once the event loop runs. Showing them now lets the size
+            # hint account for them straight away
+            if self._content.isVisible():
+                for widget in layout_widgets(self._content.layout()):
+                    if not widget.testAttribute(QtCore.Qt.WA_WState_ExplicitShowHide):
+                        widget.show()
+        self._frozen_widgets = None
+        self.clear_placeholder()
+
+    def is_content_built(self):
+        """Returns whether the content exists, either given up front or built by the content factory"""
+        return self._content_built
+
+    def build_content(self):
+        """
+        Builds the content from the content factory if it has not been built yet
+
+        :return: Whether the factory was called
+        :rtype: bool
+        """
+        if self._content_built or self.content_factory is None:
+            return False
+        self._content_built = True
+        self.content = self.content_factory()
+        if self._content.isVisible():
+            self._last_content_height = self._content.sizeHint().height()
+        return True
+
+    def prewarm(self):
+        """
+        Builds the content from the content factory once the event loop is idle, so a later expand is instant
+
+        :return: Nothing
+        :rtype: None
+        """
+        if self._content_built or self.content_factory is None:
+            return
+        if self._prewarm_timer is None:
+            # Parented so a Rollout deleted before the loop goes idle takes its pending build with it
+            self._prewarm_timer = QtCore.QTimer(self)
+            self._prewarm_timer.setSingleShot(True)
+            self._prewarm_timer.timeout.connect(self.build_content)
+        self._prewarm_timer.start(0)
+
+    def release_content(self):
+        """
+        Deletes content built by the content factory, holding its height with an empty placeholder so nothing around
+        the Rollout moves. The factory builds it again on the next expand or build_content
+
+        :return: Whether the content was released. Content given up front cannot be rebuilt and is never released
+        :rtype: bool
+        """
+        if not self._content_built or self.content_factory is None:
+            return False
+        if self._prewarm_timer is not None:
+            self._prewarm_timer.stop()
+        self._last_content_height = self._content.height()
+        self.hold_placeholder()
+        clear_layout(self._content.layout())
+        self._content_built = False
+        self._frozen_widgets = None
+        return True
+
+    def freeze_content(self):
+        """
+        Hides the content's widgets behind an empty placeholder of the same height, so they are neither laid out nor
+        painted while they are kept alive
+
+        :return: Whether the content was frozen
+        :rtype: bool
+        """
+        if not self._content_built or self._frozen_widgets is not None:
+            return False
+        self._last_content_height = self._content.height()
+        self.hold_placeholder()
+        self._frozen_widgets = [widget for widget in layout_widgets(self._content.layout()) if not widget.isHidden()]
+        for widget in self._frozen_widgets:
+            widget.setVisible(False)
+        return True
+
+    def thaw_content(self):
+        """
+        Shows the widgets freeze_content hid
+
+        :return: Whether the content was frozen
+        :rtype: bool
+        """
+        if self._frozen_widgets is None:
+            return False
+        for widget in self._frozen_widgets:
+            widget.setVisible(True)
+        self._frozen_widgets = None
+        self.clear_placeholder()
+        return True
+
+    def is_content_frozen(self):
+        """Returns whether the content is hidden behind a placeholder by freeze_content"""
+        return self._frozen_widgets is not None
+
+    def placeholder_height(self):
+        """
+        Returns the height a placeholder holds for the content: the height it had when it was last built or shown,
+        else the content_height it was given, else None
+        """
+        return self._last_content_height if self._last_content_height is not None else self.content_height
+
+    def hold_placeholder(self, height=None):
+        """
+        Fixes the content area to a height, so the Rollout keeps its size while the content is released, frozen or
+        not built yet
+
+        :param height: The height to hold. Defaults to placeholder_height
+        :type height: int | None
+
+        :return: Whether a height was held. Nothing is held when no height is known
+        :rtype: bool
+        """
+        height = self.placeholder_height() if height is None else height
+        if height is None:
+            return False
+        self._content.setFixedHeight(height)
+        return True
+
+    def is_placeholder_held(self):
+        """Returns whether the content area is fixed to a placeholder height"""
+        return self._content.maximumHeight() != QWIDGETSIZE_MAX
+
+    def clear_placeholder(self):
+        """Lets the content area size to its content again after release_content or freeze_content"""
+        self._content.setMinimumHeight(0)
+        self._content.setMaximumHeight(QWIDGETSIZE_MAX)
 
     def is_collapsed(self):
         """Returns the collapsed state of the Rollout"""
@@ -170,9 +359,23 @@ class Rollout(QtWidgets.QWidget):
             return True
         return False
 
-    def expand(self):
-        """Expands the state of the Rollout emitting 'expanded' if successful"""
+    def expand(self, build=True):
+        """
+        Expands the state of the Rollout emitting 'expanded' if successful
+
+        :param build: Build the content from the content factory and thaw frozen content. RolloutStack leaves this to
+                      its own pass for rollouts it expands out of view
+        :type build: bool
+
+        :return: Whether the Rollout was collapsed
+        :rtype: bool
+        """
         if self.is_collapsed():
+            if build:
+                self.build_content()
+                self.thaw_content()
+            elif not self._content_built:
+                self.hold_placeholder()
             self._content.setVisible(True)
             self.button.setArrowType(QtCore.Qt.DownArrow)
             self.emit(SIGNAL('expanded()'))
@@ -187,4 +390,274 @@ class Rollout(QtWidgets.QWidget):
             toggled = self.collapse()
 
         if toggled:
-            self.emit(SIGNAL('toggled()'))
\ No newline at end of file
+            self.emit(SIGNAL('toggled()'))
+
+
+class RolloutStack(QtWidgets.QScrollArea):
+    """
+    A scrolling column of Rollouts that only keeps the content of expanded Rollouts in or near view alive
+    """
+
+    def __init__(self, rollouts=None, accordion=False, keep_alive_margin=None, content_height=None, *args, **kwargs):
+        """
+        Expanded Rollouts that scroll out of range give up their content: content built by a content factory is
+        released and rebuilt when it scrolls back, and content given up front is frozen. Either way an empty
+        placeholder keeps its height, so the scroll bar does not jump. Expanded Rollouts whose content has never been
+        built hold a placeholder of their own content_height, else of content_height here, else of the average height
+        of the content built so far.
+
+        :param rollouts: The Rollouts to stack, top to bottom
+        :type rollouts: list[Rollout]
+        :param accordion: Collapse every other Rollout whenever one expands
+        :type accordion: bool
+        :param keep_alive_margin: How far above and below the view, in pixels, content is kept alive. Defaults to the
+                                  height of the view
+        :type keep_alive_margin: int | None
+        :param content_height: The height expected of content that has never been built
+        :type content_height: int | None
+        """
+        super(RolloutStack, self).__init__(*args, **kwargs)
+
+        self.accordion = accordion
+        self.keep_alive_margin = keep_alive_margin
+        self.content_height = content_height
+        self.rollouts = []  # type: list[Rollout]
+        self._bulk = False  # Set while set_expanded drives the Rollouts, so accordion mode stays out of the way
+
+        self.container = QtWidgets.QWidget()
+        self.stack_layout = QtWidgets.QVBoxLayout()
+        self.stack_layout.setSpacing(0)
+        self.stack_layout.setContentsMargins(0, 0, 0, 0)
+        self.stack_layout.addStretch()
+        self.container.setLayout(self.stack_layout)
+
+        self.setWidget(self.container)
+        self.setWidgetResizable(True)
+        self.setHorizontalScrollBarPolicy(QtCore.Qt.ScrollBarAlwaysOff)
+
+        # Scrolling and toggling come in bursts, so the content in range is only worked out once they settle
+        self.refresh_timer = QtCore.QTimer(self)
+        self.refresh_timer.setSingleShot(True)
+        self.refresh_timer.timeout.connect(self.refresh_content)
+        self.verticalScrollBar().valueChanged.connect(self.schedule_refresh)
+
+        if rollouts:
+            self.add_rollouts(rollouts)
+
+    def add_rollout(self, rollout):
+        """
+        Adds a Rollout to the bottom of the stack
+
+        :param rollout: The Rollout to add
+        :type rollout: Rollout
+
+        :return: Nothing
+        :rtype: None
+        """
+        self.add_rollouts([rollout])
+
+    def add_rollouts(self, rollouts):
+        """
+        Adds Rollouts to the bottom of the stack in a single layout pass
+
+        :param rollouts: The Rollouts to add, top to bottom
+        :type rollouts: list[Rollout]
+
+        :return: Nothing
+        :rtype: None
+        """
+        self.container.setUpdatesEnabled(False)
+        try:
+            for rollout in rollouts:
+                self.stack_layout.insertWidget(len(self.rollouts), rollout)
+                self.rollouts.append(rollout)
+                rollout.expanded.connect(self.rollout_expanded)
+                rollout.collapsed.connect(self.schedule_refresh)
+        finally:
+            self.container.setUpdatesEnabled(True)
+        self.schedule_refresh()
+
+    def remove_rollout(self, rollout):
+        """
+        Removes a Rollout from the stack and deletes it
+
+        :param rollout: The Rollout to remove
+        :type rollout: Rollout
+
+        :return: Nothing
+        :rtype: None
+        """
+        self.rollouts.remove(rollout)
+        self.stack_layout.removeWidget(rollout)
+        rollout.deleteLater()
+        self.schedule_refresh()
+
+    def clear(self):
+        """Removes and deletes every Rollout"""
+        for rollout in self.rollouts:
+            self.stack_layout.removeWidget(rollout)
+            rollout.deleteLater()
+        self.rollouts = []
+
+    def expand_all(self):
+        """Expands every Rollout, or only the first in accordion mode"""
+        self.set_expanded(self.rollouts, True)
+
+    def collapse_all(self):
+        """Collapses every Rollout"""
+        self.set_expanded(self.rollouts, False)
+
+    def set_expanded(self, rollouts, expanded):
+        """
+        Expands or collapses many Rollouts with updates disabled and lays the stack out once. Only the content that
+        lands in range is built. In accordion mode expanding keeps the first of the Rollouts open and collapses the rest
+
+        :param rollouts: The Rollouts to change
+        :type rollouts: list[Rollout]
+        :param expanded: Expand them, rather than collapse them
+        :type expanded: bool
+
+        :return: Nothing
+        :rtype: None
+        """
+        rollouts = list(rollouts)
+        if expanded and self.accordion:
+            if not rollouts:
+                return
+            kept = rollouts[0]
+            rollouts = [kept]
+        self.container.setUpdatesEnabled(False)
+        self._bulk = True
+        try:
+            if expanded and self.accordion:
+                for rollout in self.rollouts:
+                    if rollout is not kept:
+                        rollout.collapse()
+            for rollout in rollouts:
+                if expanded:
+                    rollout.expand(build=False)
+                else:
+                    rollout.collapse()
+            self.refresh_content()
+        finally:
+            self._bulk = False
+            self.container.setUpdatesEnabled(True)
+
+    def rollout_expanded(self):
+        if self.accordion and not self._bulk:
+            expanded_rollout = self.sender()
+            self.container.setUpdatesEnabled(False)
+            self._bulk = True
+            try:
+                for rollout in self.rollouts:
+                    if rollout is not expanded_rollout:
+                        rollout.collapse()
+            finally:
+                self._bulk = False
+                self.container.setUpdatesEnabled(True)
+        self.schedule_refresh()
+
+    def schedule_refresh(self, *args):
+        self.refresh_timer.start(0)
+
+    def refresh_content(self):
+        """
+        Builds or thaws the content of expanded Rollouts in range, and releases or freezes it everywhere else
+
+        :return: Nothing
+        :rtype: None
+        """
+        self.refresh_timer.stop()
+        if not self.isVisible():
+            return
+
+        scroll_bar = self.verticalScrollBar()
+        view_top = scroll_bar.value()
+        margin = self.viewport().height() if self.keep_alive_margin is None else self.keep_alive_margin
+        top = view_top - margin
+        bottom = view_top + self.viewport().height() + margin
+
+        # Content that is built or sized pushes the Rollouts below it down. Their positions are shifted by that growth
+        # as the stack is walked, so a single pass decides everything and the stack is laid out once at the end.
+        # Growth above the view is scrolled past, so what is on screen stays put
+        self.stack_layout.activate()
+        estimate = self.estimated_content_height()
+        shift = 0
+        scrolled = 0
+        unsized = []
+        for rollout in self.rollouts:
+            if not rollout.is_expanded():
+                continue
+            geometry = rollout.geometry()
+            rollout_top = geometry.top() + shift
+            if geometry.bottom() + shift >= top + scrolled and rollout_top <= bottom + scrolled:
+                grown = rollout.build_content() or rollout.thaw_content()
+            elif rollout.release_content() or rollout.freeze_content() or rollout.is_content_built():
+                grown = False
+            elif rollout.is_placeholder_held():
+                grown = False
+            else:
+                height = rollout.placeholder_height()
+                grown = rollout.hold_placeholder(estimate if height is None else height)
+                if not grown:
+                    unsized.append(rollout)
+            if grown:
+                growth = rollout.sizeHint().height() - geometry.height()
+                shift += growth
+                if rollout_top < view_top + scrolled:
+                    scrolled += growth
+
+        # Rollouts passed before any content was measured take the average of what was built on the way
+        estimate = self.estimated_content_height() if unsized else None
+        if estimate is not None:
+            self.stack_layout.activate()
+            shift = 0
+            for rollout in unsized:
+                geometry = rollout.geometry()
+                rollout.hold_placeholder(estimate)
+                growth = rollout.sizeHint().height() - geometry.height()
+                if geometry.top() + shift < view_top + scrolled:
+                    scrolled += growth
+                shift += growth
+
+        self.stack_layout.activate()
+        if scrolled:
+            scroll_bar.setValue(view_top + scrolled)
+
+    def estimated_content_height(self):
+        """
+        Guesses the height of content that has never been built
+
+        :return: content_height if it was given, else the average placeholder height of the Rollouts that have one,
+                 else None
+        :rtype: int | None
+        """
+        if self.content_height is not None:
+            return self.content_height
+        heights = [rollout.placeholder_height() for rollout in self.rollouts]
+        heights = [height for height in heights if height is not None]
+        return sum(heights) // len(heights) if heights else None
+
+    def showEvent(self, event):
+        super(RolloutStack, self).showEvent(event)
+        self.schedule_refresh()
+
+    def resizeEvent(self, event):
+        super(RolloutStack, self).resizeEvent(event)
+        self.schedule_refresh()
+
+
+"""
+Demonstrations:
+
+        def build_settings():
+            settings_layout = QtWidgets.QVBoxLayout()
+            settings_layout.addWidget(QtWidgets.QCheckBox('Triangulate'))
+            return settings_layout
+
+        self.rollout = ps2_Rollout.Rollout(label='Settings', content_factory=build_settings, collapsed=True)
+
+        self.rollout_stack = ps2_Rollout.RolloutStack(accordion=True)
+        self.rollout_stack.add_rollouts([ps2_Rollout.Rollout(label=str(index), content_factory=build_settings,
+                                                             collapsed=True) for index in range(200)])
+"""